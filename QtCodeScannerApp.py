@@ -1,26 +1,33 @@
 # CodebaseScanner/QtCodeScannerApp.py
 
 import os
+import re
+import logging
+import logging.handlers
 import sys
-import fnmatch
+import queue
+import threading
+import time
 import traceback
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QLineEdit, QPushButton, QFileDialog, QMessageBox, QCheckBox,
     QTreeWidget, QTreeWidgetItem, QHeaderView, QMenuBar, QStatusBar, QFrame,
-    QInputDialog, QAbstractItemView, QTreeWidgetItemIterator, QGroupBox, QSplitter,
+    QInputDialog, QAbstractItemView, QGroupBox, QSplitter,
     QStyle, QTabWidget, QProgressDialog,
 )
-from PySide6.QtCore import QThread, QObject, Signal, Qt
+from PySide6.QtCore import QThread, QObject, Signal, Qt, QTimer
 from PySide6.QtGui import QClipboard, QColor, QBrush
 
 import app_config
 import profile_handler
 import rule_manager
 import scan_engine
-from dialogs_qt.QtEditDefaultsDialog import QtEditDefaultsDialog
-from dialogs_qt.QtManageProfilesDialog import QtManageProfilesDialog
-from dialogs_qt.QtJsonScanDialog import QtJsonScanDialog
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Stylesheet
@@ -109,36 +116,127 @@ QProgressBar {
 }
 QProgressBar::chunk { background-color: #0050a0; border-radius: 3px; }
 QProgressDialog { background-color: #2e2e2e; }
+QWidget#TokenBar, QWidget#TokenBar QLabel {
+    background-color: #383838;
+    border: 1px solid #555;
+    border-radius: 4px;
+}
+QLabel#TokenCount { color: #88ccff; font-weight: bold; }
+QPushButton#RunButton, QPushButton#RunCopyButton {
+    font-size: 12pt;
+    font-weight: bold;
+    padding: 12px 24px;
+}
+QPushButton#RunCopyButton { background-color: #1a5276; border-color: #2471a3; }
 """
 
+
+def _ensure_stylesheet():
+    """Applies the dark theme application-wide, once; re-applying forces a full re-polish."""
+    app = QApplication.instance()
+    if app is not None and app.styleSheet() != DARK_THEME_STYLESHEET:
+        app.setStyleSheet(DARK_THEME_STYLESHEET)
+
+
 # Token data roles stored on each QTreeWidgetItem
 TOKEN_ROLE  = Qt.ItemDataRole.UserRole + 1   # int: token count for this item
 HIDDEN_ROLE = Qt.ItemDataRole.UserRole + 2   # bool: True if item is tree-blacklisted (greyed)
 
+# normpath is pure, so the user-entered paths that are re-normalised on every
+# profile save/scan can be memoised without any invalidation.
+_norm = lru_cache(maxsize=256)(os.path.normpath)
+
+# Resolved once per session instead of on every profile switch / browse.
+_HOME_DIR = os.path.expanduser("~")
+_DEFAULT_SAVE_PATH = os.path.join(app_config.get_downloads_folder(), app_config.DEFAULT_OUTPUT_FILENAME)
+
+# Parsed default ignore patterns and the (mtime_ns, size) they were read at.
+# Shared by all tabs; reparsed only when the defaults file changes on disk.
+_default_ignore_cache: tuple[tuple[int, int], tuple[tuple, tuple]] | None = None
+
+
+def _invalidate_default_ignore_patterns():
+    """Forgets the cached defaults; call after rewriting DEFAULT_IGNORE_PATH."""
+    global _default_ignore_cache
+    # On filesystems with coarse timestamps a same-size rewrite can keep the
+    # old fingerprint, so don't rely on it across our own writes.
+    _default_ignore_cache = None
+
+
+def _read_default_ignore_patterns() -> dict:
+    """Returns {'file': [...], 'folder': [...]} from DEFAULT_IGNORE_PATH."""
+    global _default_ignore_cache
+    try:
+        st = os.stat(app_config.DEFAULT_IGNORE_PATH)
+    except OSError:
+        return {'file': [], 'folder':[]}
+    fingerprint = (st.st_mtime_ns, st.st_size)
+    if _default_ignore_cache is not None and _default_ignore_cache[0] == fingerprint:
+        file_patterns, folder_patterns = _default_ignore_cache[1]
+        return {'file': list(file_patterns), 'folder': list(folder_patterns)}
+
+    patterns = {'file': [], 'folder':[]}
+    try:
+        with open(app_config.DEFAULT_IGNORE_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.lower().startswith("file:"):
+                    patterns['file'].append(line[len("file:"):].strip())
+                elif line.lower().startswith("folder:"):
+                    patterns['folder'].append(line[len("folder:"):].strip())
+    except Exception:
+        return patterns
+    # Cache immutable copies so no caller can alter another tab's patterns.
+    _default_ignore_cache = (fingerprint, (tuple(patterns['file']), tuple(patterns['folder'])))
+    return patterns
+
 # ---------------------------------------------------------------------------
 # Scan Worker (runs in thread)
 # ---------------------------------------------------------------------------
 
 class ScanWorker(QObject):
-    status_update = Signal(str)
     scan_finished = Signal(str)
     scan_error = Signal(str, str)
+    scan_cancelled = Signal()
 
-    def __init__(self, scan_params):
+    def __init__(self, scan_params, progress_queue: queue.SimpleQueue):
         super().__init__()
         self.scan_params = scan_params
+        # Status text is pushed here and polled by the GUI, rather than
+        # emitting one cross-thread signal per directory.
+        self.progress_queue = progress_queue
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Asks the running scan to stop at the next directory or file."""
+        self._cancel_event.set()
+
+    def _report(self, message: str):
+        self.progress_queue.put(message)
 
     def run(self):
+        p = self.scan_params
+        # Written beside the target and swapped in at the end, so a failed or
+        # interrupted scan never leaves a truncated output file behind.
+        tmp_path = p['save_path_norm'] + ".part"
         try:
-            p = self.scan_params
-            with open(p['save_path_norm'], "w", encoding="utf-8") as output_file:
+            # Tree text, headers and file bodies all go through this one large buffer.
+            with open(tmp_path, "w", encoding="utf-8",
+                      buffering=scan_engine.OUTPUT_BUFFER_BYTES) as output_file:
+                # Directory listings made for the tree are handed on to the scan
+                # so each directory is enumerated once.
+                listing_cache = {} if p['generate_tree'] else None
                 if p['generate_tree']:
-                    self.status_update.emit("Generating directory tree...")
-                    norm_blacklist =[os.path.normpath(x) for x in p['tree_blacklist']]
-                    tree_header = f"# Directory Tree for: {os.path.basename(p['scan_dir_norm'])}\n\n"
-                    tree_structure = scan_engine.generate_directory_tree_text(p['scan_dir_norm'], norm_blacklist)
-                    output_file.write(tree_header)
-                    output_file.write(tree_structure or f"{os.path.basename(p['scan_dir_norm'])}/\n (No subdirectories found or all were blacklisted)\n")
+                    self._report("Generating directory tree...")
+                    output_file.write(f"# Directory Tree for: {os.path.basename(p['scan_dir_norm'])}\n\n")
+                    # Lines go straight into the buffered output rather than
+                    # being assembled into one large string first.
+                    if not scan_engine.write_directory_tree(
+                            output_file.write, p['scan_dir_norm'], p['tree_blacklist'],
+                            listing_cache=listing_cache):
+                        output_file.write(f"{os.path.basename(p['scan_dir_norm'])}/\n (No subdirectories found or all were blacklisted)\n")
                     output_file.write("\n\n---\n\n")
 
                 output_file.write(f"# Codebase Scan: {os.path.basename(p['scan_dir_norm'])}\n\n")
@@ -157,48 +255,123 @@ class ScanWorker(QObject):
                 if p['filter_mode'] == app_config.FILTER_WHITELIST and p['scan_dir_norm'] in p['rules_folders']:
                     initial_whitelisted.append(p['scan_dir_norm'])
 
+                # File reads overlap with formatting/writing; output order is unchanged.
                 scan_engine.process_directory(
                     p['scan_dir_norm'], output_file, p['rules_files'], p['rules_folders'],
-                    p['filter_mode'], level=0, status_callback=self.status_update.emit,
-                    whitelisted_ancestor_folders=initial_whitelisted
+                    p['filter_mode'], level=0, status_callback=self._report,
+                    whitelisted_ancestor_folders=initial_whitelisted,
+                    executor=scan_engine.shared_io_pool(), listing_cache=listing_cache,
+                    cancel_event=self._cancel_event
                 )
+            os.replace(tmp_path, p['save_path_norm'])
             self.scan_finished.emit(p['save_path_norm'])
+        except scan_engine.ScanCancelled:
+            self._discard_partial(tmp_path)
+            self.scan_cancelled.emit()
         except Exception as e:
+            self._discard_partial(tmp_path)
             self.scan_error.emit(str(e), traceback.format_exc())
 
+    @staticmethod
+    def _discard_partial(tmp_path: str):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
 
 # ---------------------------------------------------------------------------
 # Tree Token Worker (runs in thread)
 # ---------------------------------------------------------------------------
 
 class TreeTokenWorker(QObject):
-    """Traverses the directory tree, counts tokens, emits per-item data."""
+    """Traverses the directory tree, counts tokens, emits per-item data in batches."""
 
     LARGE_DIR_THRESHOLD = 500
 
     TOKENS_LARGE_DIR   = -1   
     TOKENS_TREE_HIDDEN = -3   
 
+    # Progress is reported every PROGRESS_STEP files (and on the last one)
+    # instead of queueing a cross-thread signal per file.
+    PROGRESS_STEP = 64
+
+    # How many files may be counted ahead of the emitter.
+    COUNT_WINDOW = 256
+
+    # Rows are sent to the GUI in batches, flushed at ~20 Hz or when full,
+    # rather than as one queued signal per tree entry.
+    ITEM_BATCH_SECONDS = 0.05
+    ITEM_BATCH_MAX = 512
+
     progress = Signal(int, int)           
-    item_ready = Signal(str, bool, int)   
+    items_ready = Signal(list)            # [(abs_path, is_dir, token_count), ...]
     finished = Signal(int)                
     error = Signal(str)
+    cancelled = Signal()                  # run() stopped early after cancel()
 
     def __init__(self, scan_dir, default_ignore_patterns, tree_blacklist,
                  rules_files=None, rules_folders=None, filter_mode=None):
         super().__init__()
         self.scan_dir = scan_dir
         self.default_ignore_patterns = default_ignore_patterns
-        self.tree_blacklist = {os.path.normpath(p) for p in tree_blacklist}
-        self.rules_files  =[os.path.normpath(p) for p in (rules_files or [])]
-        self.rules_folders =[os.path.normpath(p) for p in (rules_folders or [])]
+        self._folder_ignore_re = rule_manager.compile_name_patterns(default_ignore_patterns.get('folder', []))
+        self._file_ignore_re = rule_manager.compile_name_patterns(default_ignore_patterns.get('file', []))
+        # The tab only ever stores normalised paths, so these are plain snapshots.
+        self.tree_blacklist = frozenset(tree_blacklist)
+        self.rules_files  = frozenset(rules_files or ())
+        self.rules_folders = frozenset(rules_folders or ())
         self.filter_mode  = filter_mode 
-        self._cancelled = False
+        self._cancel_event = threading.Event()
+        self._batch: list = []
+        self._batch_started = 0.0
 
     def cancel(self):
-        self._cancelled = True
+        """Thread-safe: may be called directly from the GUI thread."""
+        self._cancel_event.set()
+
+    def _queue_item(self, abs_path: str, is_dir: bool, token_count: int):
+        if not self._batch:
+            self._batch_started = time.monotonic()
+        self._batch.append((abs_path, is_dir, token_count))
+        if (len(self._batch) >= self.ITEM_BATCH_MAX
+                or time.monotonic() - self._batch_started >= self.ITEM_BATCH_SECONDS):
+            self._flush_items()
+
+    def _flush_items(self):
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self.items_ready.emit(batch)
+
+    def _emit_counted(self, entry, total: int):
+        """Emits one pass-3 result: None = inside a skipped large dir, int = excluded, else a Future."""
+        i, fpath, result = entry
+        if result is not None:
+            tokens = result if isinstance(result, int) else result.result()
+            self._queue_item(fpath, False, tokens)
+        self._report_progress(i + 1, total)
+
+    @staticmethod
+    def _cancel_pending(pending):
+        """Drops queued counts; the pool is shared, so it is not shut down."""
+        for _, _, result in pending:
+            if result is not None and not isinstance(result, int):
+                result.cancel()
+
+    def _abandon(self, pending=()):
+        """Ends a cancelled run: drops unsent work and tells the owner the thread can stop."""
+        self._cancel_pending(pending)
+        self._batch = []
+        self.cancelled.emit()
+
+    def _report_progress(self, done: int, total: int):
+        if done % self.PROGRESS_STEP == 0 or done == total:
+            self.progress.emit(done, total)
 
     def run(self):
+        # Pass-3 counts in flight; cancelled on every early exit, errors included,
+        # so they do not keep the shared pool busy into the next scan.
+        pending: deque = deque()
         try:
             # Pass 1: collect dirs/files and build subtree file-count map.
             all_files: list[str] = []
@@ -206,41 +379,59 @@ class TreeTokenWorker(QObject):
             blacklisted_dirs_to_show: list[str] = []
             direct_count: dict[str, int] = {}
 
-            for root, dirs, files in os.walk(self.scan_dir):
-                if self._cancelled:
+            # Pre-order walk over an explicit scandir stack, visiting
+            # directories in the same order os.walk(topdown) would. entry.path
+            # is already joined onto the normalised root, and the directory
+            # and symlink tests reuse the type scandir read with the listing.
+            folder_re = self._folder_ignore_re
+            file_re = self._file_ignore_re
+            stack = [os.path.normpath(self.scan_dir)]
+            while stack:
+                if self._cancel_event.is_set():
+                    self._abandon()
                     return
-                norm_root = os.path.normpath(root)
-                folder_patterns = self.default_ignore_patterns.get('folder',[])
-
-                blacklisted_here = sorted([
-                        os.path.normpath(os.path.join(norm_root, d))
-                        for d in dirs
-                        if os.path.normpath(os.path.join(norm_root, d)) in self.tree_blacklist
-                        and not any(fnmatch.fnmatch(d, p) for p in folder_patterns)
-                    ]
-                )
-                blacklisted_dirs_to_show.extend(blacklisted_here)
-
-                dirs[:] = sorted([
-                        d for d in dirs
-                        if os.path.normpath(os.path.join(norm_root, d)) not in self.tree_blacklist
-                        and not any(fnmatch.fnmatch(d, p) for p in folder_patterns)
-                    ],
-                    key=str.lower,
-                )
+                norm_root = stack.pop()
+                # One sort of the whole listing: the partition below is
+                # stable, so dirs and files both come out already in order.
+                try:
+                    with os.scandir(norm_root) as it:
+                        entries = sorted(it, key=lambda e: e.name.lower())
+                except OSError:
+                    continue
+
+                kept_dirs = []
+                blacklisted_here = []
+                files = []
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        files.append(entry)
+                    elif rule_manager.matches_name_patterns(folder_re, entry.name):
+                        continue
+                    elif entry.path in self.tree_blacklist:
+                        blacklisted_here.append(entry.path)
+                    else:
+                        kept_dirs.append(entry)
+                blacklisted_dirs_to_show.extend(sorted(blacklisted_here))
+
                 all_dirs.append(norm_root)
-                file_patterns = self.default_ignore_patterns.get('file',[])
                 n = 0
-                for f in sorted(files, key=str.lower):
-                    if not any(fnmatch.fnmatch(f, p) for p in file_patterns):
-                        all_files.append(os.path.normpath(os.path.join(norm_root, f)))
+                for entry in files:
+                    if not rule_manager.matches_name_patterns(file_re, entry.name):
+                        all_files.append(entry.path)
                         n += 1
                 direct_count[norm_root] = n
 
+                # Like os.walk, symlinked directories are not descended into.
+                stack.extend(e.path for e in reversed(kept_dirs) if not e.is_symlink())
+
             # Pass 1b: compute subtree file counts.
             subtree_count: dict[str, int] = dict(direct_count)
             for d in sorted(all_dirs, key=lambda x: x.count(os.sep), reverse=True):
-                parent = os.path.normpath(os.path.dirname(d))
+                parent = os.path.dirname(d)
                 if parent in subtree_count and parent != d:
                     subtree_count[parent] = subtree_count.get(parent, 0) + subtree_count.get(d, 0)
 
@@ -255,48 +446,61 @@ class TreeTokenWorker(QObject):
 
             # Pass 2: emit tree structure.
             for d in all_dirs:
-                if self._cancelled:
+                if self._cancel_event.is_set():
+                    self._abandon()
                     return
                 sentinel = self.TOKENS_LARGE_DIR if d in skipped_dirs else 0
-                self.item_ready.emit(d, True, sentinel)
+                self._queue_item(d, True, sentinel)
 
             for d in blacklisted_dirs_to_show:
-                if self._cancelled:
+                if self._cancel_event.is_set():
+                    self._abandon()
                     return
-                self.item_ready.emit(d, True, self.TOKENS_TREE_HIDDEN)
+                self._queue_item(d, True, self.TOKENS_TREE_HIDDEN)
 
-            # Pass 3: count tokens.
+            # Pass 3: count tokens. Reads and encodes run on the shared I/O pool
+            # (both release the GIL); results are emitted in walk order so rows
+            # are still appended under their parents alphabetically.
             total = len(all_files)
-            whitelisted_parents = list(self.rules_folders) if self.filter_mode is not None else[]
+            whitelisted_parents = self.rules_folders if self.filter_mode is not None else frozenset()
 
+            pool = scan_engine.shared_io_pool()
             for i, fpath in enumerate(all_files):
-                if self._cancelled:
+                if self._cancel_event.is_set():
+                    self._abandon(pending)
                     return
 
-                parent_dir = os.path.normpath(os.path.dirname(fpath))
+                parent_dir = os.path.dirname(fpath)
 
                 if parent_dir in skipped_dirs:
-                    self.progress.emit(i + 1, total)
-                    continue
+                    result = None
+                elif self.filter_mode is not None and not scan_engine.should_process_normalized(
+                    fpath, True,
+                    self.rules_files, self.rules_folders,
+                    self.filter_mode, whitelisted_parents
+                ):
+                    result = 0
+                elif os.path.splitext(fpath)[1].lower() not in app_config.LANG_MAP:
+                    # _build_tree_item zeroes these anyway; don't read and encode them.
+                    result = 0
+                else:
+                    result = pool.submit(scan_engine.count_tokens_for_file, fpath)
+                pending.append((i, fpath, result))
 
-                if self.filter_mode is not None:
-                    included = scan_engine.should_process_item(
-                        fpath, True,
-                        self.rules_files, self.rules_folders,
-                        self.filter_mode, whitelisted_parents
-                    )
-                    if not included:
-                        self.item_ready.emit(fpath, False, 0)
-                        self.progress.emit(i + 1, total)
-                        continue
+                while len(pending) > self.COUNT_WINDOW:
+                    self._emit_counted(pending.popleft(), total)
 
-                tokens = scan_engine.count_tokens_for_file(fpath)
-                self.item_ready.emit(fpath, False, tokens)
-                self.progress.emit(i + 1, total)
+            while pending:
+                if self._cancel_event.is_set():
+                    self._abandon(pending)
+                    return
+                self._emit_counted(pending.popleft(), total)
+            self._flush_items()
 
-            tree_tok = scan_engine.estimate_tree_tokens(self.scan_dir, list(self.tree_blacklist))
+            tree_tok = scan_engine.estimate_tree_tokens(self.scan_dir, self.tree_blacklist)
             self.finished.emit(tree_tok)
         except Exception as e:
+            self._cancel_pending(pending)
             self.error.emit(str(e))
 
 
@@ -310,6 +514,16 @@ class WorkspaceTab(QWidget):
 
     dirty_changed = Signal(bool)
 
+    # Tooltip texts are formatted once here instead of per row / per toggle.
+    HIDDEN_DIR_TOOLTIP = "Tree-blacklisted: hidden from directory tree output"
+    LARGE_DIR_TOOLTIP = f"Skipped: >{TreeTokenWorker.LARGE_DIR_THRESHOLD} files in subtree"
+    SCAN_RULE_TOOLTIPS = {
+        True: "Mark selected items to include in the scan.",
+        False: "Mark selected items to exclude from the scan.",
+    }
+    # Shared by every tree-blacklisted row rather than built per row.
+    HIDDEN_DIR_BRUSH = QBrush(QColor(120, 120, 120))
+
     def __init__(self, profiles_ref, parent=None):
         super().__init__(parent)
         self._profiles_ref = profiles_ref  
@@ -317,22 +531,44 @@ class WorkspaceTab(QWidget):
         # State
         self.current_rules_filepath = ""
         self.filter_mode = app_config.FILTER_BLACKLIST
-        self.rules_files: list[str] = []
-        self.rules_folders: list[str] = []
+        # Sets: rule application and per-item visuals only ever test membership;
+        # rule_manager.save_ignore_rules() sorts them when writing.
+        self.rules_files: set[str] = set()
+        self.rules_folders: set[str] = set()
         self.rules_dirty = False
-        self.directory_tree_blacklist: list[str] = []
+        # Insertion-ordered dict used as an ordered set: O(1) membership/add/remove.
+        # Like the rule sets, it only ever holds normalised paths (rule_manager
+        # normalises on load, tree rows carry normalised paths), so consumers
+        # test membership directly instead of re-normalising a copy.
+        self.directory_tree_blacklist: dict[str, None] = {}
         self.default_ignore_patterns: dict = {'file': [], 'folder':[]}
         self.active_profile_name: str | None = None
 
         # Threading
         self._token_thread: QThread | None = None
         self._token_worker: TreeTokenWorker | None = None
+        self._scan_thread: QThread | None = None
+        self._scan_worker: ScanWorker | None = None
+        self._scan_progress: queue.SimpleQueue = queue.SimpleQueue()
+        self._status_slot = None
+        self._scan_progress_timer = QTimer(self)
+        self._scan_progress_timer.setInterval(50)
+        self._scan_progress_timer.timeout.connect(self._drain_scan_progress)
 
         # Token tracking
         self._tree_tokens = 0
+        self._token_recalc_pending = False
+        self._token_labels_stale = False
 
         # Show/hide tree-blacklisted dirs
         self._show_hidden_dirs: bool = False
+        self._hidden_items: list[QTreeWidgetItem] = []
+        # Every tree row by its normalised path: finds a new row's parent while
+        # loading, and maps changed rule paths back to their rows.
+        self._path_to_item: dict[str, QTreeWidgetItem] = {}
+        # Rows waiting for _flush_rule_marks(): item -> (path, is_dir).
+        self._pending_rule_marks: dict = {}
+        self._rule_marks_flush_pending = False
 
         self._setup_ui()
 
@@ -418,16 +654,17 @@ class WorkspaceTab(QWidget):
         splitter.setSizes([300, 500])
 
         # Token summary bar
+        # Styled through object names in the app stylesheet rather than
+        # per-widget style sheets, which each cost a separate parse and polish.
         token_bar = QWidget()
-        token_bar.setStyleSheet("background-color: #383838; border: 1px solid #555; border-radius: 4px;")
+        token_bar.setObjectName("TokenBar")
         tb_layout = QHBoxLayout(token_bar)
         tb_layout.setContentsMargins(10, 4, 10, 4)
-        lbl_style = "color: #88ccff; font-weight: bold;"
         self.lbl_tree_tokens = QLabel("Tree: — tk")
         self.lbl_scan_tokens = QLabel("Scan: — tk")
         self.lbl_total_tokens = QLabel("Total: — tk")
         for lbl in (self.lbl_tree_tokens, self.lbl_scan_tokens, self.lbl_total_tokens):
-            lbl.setStyleSheet(lbl_style)
+            lbl.setObjectName("TokenCount")
         tb_layout.addStretch()
         tb_layout.addWidget(QLabel("Tokens →"))
         tb_layout.addSpacing(8)
@@ -440,14 +677,14 @@ class WorkspaceTab(QWidget):
 
         # Run buttons
         self.run_scan_btn = QPushButton("Run Scan")
-        self.run_scan_btn.setStyleSheet("font-size: 12pt; font-weight: bold; padding: 12px 24px;")
+        self.run_scan_btn.setObjectName("RunButton")
         self.run_copy_btn = QPushButton("▶  Run Scan && Copy to Clipboard")
-        self.run_copy_btn.setStyleSheet(
-            "font-size: 12pt; font-weight: bold; padding: 12px 24px;"
-            "background-color: #1a5276; border-color: #2471a3;"
-        )
+        self.run_copy_btn.setObjectName("RunCopyButton")
         self.run_json_btn = QPushButton("Targeted JSON Scan")
-        self.run_json_btn.setStyleSheet("font-size: 12pt; font-weight: bold; padding: 12px 24px;")
+        self.run_json_btn.setObjectName("RunButton")
+        self.cancel_scan_btn = QPushButton("Cancel Scan")
+        self.cancel_scan_btn.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_BrowserStop))
+        self.cancel_scan_btn.setEnabled(False)
 
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
@@ -456,6 +693,8 @@ class WorkspaceTab(QWidget):
         btn_layout.addWidget(self.run_copy_btn)
         btn_layout.addSpacing(16)
         btn_layout.addWidget(self.run_json_btn)
+        btn_layout.addSpacing(16)
+        btn_layout.addWidget(self.cancel_scan_btn)
         btn_layout.addStretch()
 
         main_layout.addWidget(splitter, 1)
@@ -473,11 +712,10 @@ class WorkspaceTab(QWidget):
         self.run_scan_btn.clicked.connect(lambda: self._run_scan(copy_to_clipboard=False))
         self.run_copy_btn.clicked.connect(lambda: self._run_scan(copy_to_clipboard=True))
         self.run_json_btn.clicked.connect(self._run_json_scan)
+        self.cancel_scan_btn.clicked.connect(self._cancel_scan)
 
         # Defaults
-        self.save_path_entry.setText(
-            os.path.join(app_config.get_downloads_folder(), app_config.DEFAULT_OUTPUT_FILENAME)
-        )
+        self.save_path_entry.setText(_DEFAULT_SAVE_PATH)
         self.generate_tree_check.setChecked(True)
         self._on_filter_mode_change()
 
@@ -508,6 +746,9 @@ class WorkspaceTab(QWidget):
         self.tree.header().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
         self.tree.header().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
         self.tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        # All rows share one height, so the view can map scroll offsets to rows
+        # arithmetically and only lay out/paint the visible slice.
+        self.tree.setUniformRowHeights(True)
         tl.addWidget(self.tree)
 
         ar_layout = QHBoxLayout()
@@ -563,9 +804,9 @@ class WorkspaceTab(QWidget):
             if reply == QMessageBox.StandardButton.No:
                 return False
 
-        self.scan_dir_entry.setText(profile_data.get("scan_directory", ""))
-        down = os.path.join(app_config.get_downloads_folder(), app_config.DEFAULT_OUTPUT_FILENAME)
-        self.save_path_entry.setText(profile_data.get("save_filepath", down))
+        scan_dir = profile_data.get("scan_directory", "")
+        self.scan_dir_entry.setText(scan_dir)
+        self.save_path_entry.setText(profile_data.get("save_filepath", _DEFAULT_SAVE_PATH))
         self.filter_mode_check.setChecked(
             profile_data.get("filter_mode", app_config.FILTER_BLACKLIST) == app_config.FILTER_WHITELIST
         )
@@ -573,10 +814,10 @@ class WorkspaceTab(QWidget):
         self._set_rules_directory_and_load(profile_data.get("rules_directory", ""))
         self._set_dirty(False)
 
-        if self.scan_dir_entry.text() and os.path.isdir(self.scan_dir_entry.text()):
-            self._populate_tree_view()
+        if scan_dir and os.path.isdir(scan_dir):
+            self._start_tree_population(scan_dir)
         else:
-            self.tree.clear()
+            self._clear_tree()
             self._reset_token_labels()
 
         self.active_profile_name = profile_name
@@ -584,18 +825,20 @@ class WorkspaceTab(QWidget):
         return True
 
     def get_profile_data(self) -> dict:
+        rules_dir = self.rules_dir_entry.text()
         return {
-            "scan_directory": os.path.normpath(self.scan_dir_entry.text()),
-            "save_filepath": os.path.normpath(self.save_path_entry.text()),
-            "rules_directory": os.path.normpath(self.rules_dir_entry.text()) if self.rules_dir_entry.text() else "",
-            "rules_filepath": os.path.normpath(self.current_rules_filepath) if self.current_rules_filepath else "",
+            "scan_directory": _norm(self.scan_dir_entry.text()),
+            "save_filepath": _norm(self.save_path_entry.text()),
+            "rules_directory": _norm(rules_dir) if rules_dir else "",
+            "rules_filepath": _norm(self.current_rules_filepath) if self.current_rules_filepath else "",
             "filter_mode": self.filter_mode,
             "directory_tree_blacklist": list(self.directory_tree_blacklist),
             "generate_directory_tree": self.generate_tree_check.isChecked(),
         }
 
     def validate_for_scan(self) -> tuple[bool, str]:
-        if not self.scan_dir_entry.text() or not os.path.isdir(self.scan_dir_entry.text()):
+        scan_dir = self.scan_dir_entry.text()
+        if not scan_dir or not os.path.isdir(scan_dir):
             return False, "Please select a valid directory to scan."
         if not self.save_path_entry.text():
             return False, "Please select a valid output file path."
@@ -608,10 +851,8 @@ class WorkspaceTab(QWidget):
     def _on_filter_mode_change(self):
         is_wl = self.filter_mode_check.isChecked()
         self.filter_mode = app_config.FILTER_WHITELIST if is_wl else app_config.FILTER_BLACKLIST
-        self.add_scan_rule_btn.setToolTip(
-            f"Mark selected items to {'include in' if is_wl else 'exclude from'} the scan."
-        )
-        self._recalculate_token_labels()
+        self.add_scan_rule_btn.setToolTip(self.SCAN_RULE_TOOLTIPS[is_wl])
+        self._schedule_token_recalc()
 
     def _on_generate_tree_toggle(self):
         if self.active_profile_name:
@@ -623,13 +864,15 @@ class WorkspaceTab(QWidget):
 
     def _browse_scan_directory(self):
         d = QFileDialog.getExistingDirectory(self, "Select Directory to Scan",
-                                             self.scan_dir_entry.text() or os.path.expanduser("~"))
+                                             self.scan_dir_entry.text() or _HOME_DIR)
         if d:
-            self.scan_dir_entry.setText(os.path.normpath(d))
-            self._populate_tree_view()
+            norm = os.path.normpath(d)
+            self.scan_dir_entry.setText(norm)
+            # The dialog only returns existing directories; skip re-validating.
+            self._start_tree_population(norm)
 
     def _browse_save_file(self):
-        init = os.path.dirname(self.save_path_entry.text()) or self.scan_dir_entry.text() or os.path.expanduser("~")
+        init = os.path.dirname(self.save_path_entry.text()) or self.scan_dir_entry.text() or _HOME_DIR
         fp, _ = QFileDialog.getSaveFileName(self, "Save Scan Output As",
                                             os.path.join(init, app_config.DEFAULT_OUTPUT_FILENAME),
                                             "Text Files (*.txt);;Markdown Files (*.md);;All Files (*.*)")
@@ -637,7 +880,7 @@ class WorkspaceTab(QWidget):
             self.save_path_entry.setText(os.path.normpath(fp))
 
     def _browse_rules_directory(self):
-        init = self.rules_dir_entry.text() or self.scan_dir_entry.text() or os.path.expanduser("~")
+        init = self.rules_dir_entry.text() or self.scan_dir_entry.text() or _HOME_DIR
         d = QFileDialog.getExistingDirectory(self, "Select Rules Directory", init)
         if not d:
             return
@@ -660,8 +903,11 @@ class WorkspaceTab(QWidget):
     # ------------------------------------------------------------------
 
     def _edit_defaults_dialog(self):
+        from dialogs_qt.QtEditDefaultsDialog import QtEditDefaultsDialog
         dialog = QtEditDefaultsDialog(self, app_config.DEFAULT_IGNORE_PATH, self)
         dialog.exec()
+        # The dialog may have rewritten the file (even a failed save truncates it).
+        _invalidate_default_ignore_patterns()
 
     def _set_rules_directory_and_load(self, dir_path: str, prompt_create=False):
         if not dir_path or not os.path.isdir(dir_path):
@@ -698,21 +944,24 @@ class WorkspaceTab(QWidget):
         self._load_rules_from_file()
 
     def _load_rules_from_file(self):
+        previous_rules = (self.rules_files, self.rules_folders, self.directory_tree_blacklist)
         if not self.current_rules_filepath:
-            self.rules_files, self.rules_folders, self.directory_tree_blacklist = [], [],[]
+            self.rules_files, self.rules_folders, self.directory_tree_blacklist = set(), set(), {}
         else:
             try:
-                self.rules_files, self.rules_folders, self.directory_tree_blacklist = (
+                rules_files, rules_folders, tree_blacklist = (
                     rule_manager.load_ignore_rules(self.current_rules_filepath)
                 )
+                self.rules_files, self.rules_folders = set(rules_files), set(rules_folders)
+                self.directory_tree_blacklist = dict.fromkeys(tree_blacklist)
             except Exception as e:
                 QMessageBox.critical(self, "Load Error",
                                      f"Could not load scan rules from "
                                      f"{os.path.basename(self.current_rules_filepath)}:\n{e}")
-                self.rules_files, self.rules_folders, self.directory_tree_blacklist = [], [],[]
+                self.rules_files, self.rules_folders, self.directory_tree_blacklist = set(), set(), {}
 
         self._set_dirty(False)
-        self._update_all_tree_visuals()
+        self._refresh_changed_rule_marks(*previous_rules)
 
     def _save_rules_list_changes(self) -> bool:
         path = self.current_rules_filepath
@@ -745,36 +994,28 @@ class WorkspaceTab(QWidget):
     # ------------------------------------------------------------------
 
     def _load_default_ignore_patterns(self):
-        self.default_ignore_patterns = {'file': [], 'folder':[]}
-        try:
-            with open(app_config.DEFAULT_IGNORE_PATH, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    if line.lower().startswith("file:"):
-                        self.default_ignore_patterns['file'].append(line[len("file:"):].strip())
-                    elif line.lower().startswith("folder:"):
-                        self.default_ignore_patterns['folder'].append(line[len("folder:"):].strip())
-        except Exception:
-            pass
+        self.default_ignore_patterns = _read_default_ignore_patterns()
 
     def _populate_tree_view(self):
         scan_dir = self.scan_dir_entry.text()
         if not scan_dir or not os.path.isdir(scan_dir):
             QMessageBox.critical(self, "Input Error", "Please select a valid directory to scan first.")
             return
+        self._start_tree_population(scan_dir)
 
+    def _start_tree_population(self, scan_dir: str):
+        """Rebuilds the tree for *scan_dir*, which the caller has already validated."""
         if self._token_worker:
             try:
                 self._token_worker.cancel()
             except RuntimeError:
                 pass
             for sig in (
-                self._token_worker.item_ready,
+                self._token_worker.items_ready,
                 self._token_worker.progress,
                 self._token_worker.finished,
                 self._token_worker.error,
+                self._token_worker.cancelled,
             ):
                 try:
                     sig.disconnect()
@@ -790,7 +1031,7 @@ class WorkspaceTab(QWidget):
                 pass
             self._token_thread = None
 
-        self.tree.clear()
+        self._clear_tree()
         self._reset_token_labels()
         self._load_default_ignore_patterns()
 
@@ -800,33 +1041,41 @@ class WorkspaceTab(QWidget):
         self._progress_dlg.setMinimumDuration(300)
         self._progress_dlg.setValue(0)
 
-        self._path_to_item: dict[str, QTreeWidgetItem] = {}
-
         root_item = QTreeWidgetItem(self.tree, [f"📁 {os.path.basename(scan_dir)}"])
-        root_item.setData(0, Qt.ItemDataRole.UserRole, (scan_dir, True))
+        root_path = _norm(scan_dir)
+        root_item.setData(0, Qt.ItemDataRole.UserRole, (root_path, True))
         root_item.setData(0, TOKEN_ROLE, 0)
-        root_item.setExpanded(True)
-        self._path_to_item[os.path.normpath(scan_dir)] = root_item
+        # The root stays collapsed while rows stream in: the view does no
+        # row layout for children of a collapsed item, so each batch is only
+        # laid out once, when the root opens at the end of the load.
+        self._path_to_item[root_path] = root_item
+        self._update_tree_visuals_for_items([root_item])
 
         self._token_thread = QThread(self)
         self._token_worker = TreeTokenWorker(
             scan_dir,
             self.default_ignore_patterns,
             self.directory_tree_blacklist,
-            rules_files=list(self.rules_files),
-            rules_folders=list(self.rules_folders),
+            # The worker snapshots these into its own frozensets, so no copy is needed here.
+            rules_files=self.rules_files,
+            rules_folders=self.rules_folders,
             filter_mode=self.filter_mode,
         )
         self._token_worker.moveToThread(self._token_thread)
 
         self._token_thread.started.connect(self._token_worker.run)
-        self._token_worker.item_ready.connect(self._on_tree_item_ready)
+        self._token_worker.items_ready.connect(self._on_tree_items_ready)
         self._token_worker.progress.connect(self._on_tree_progress)
         self._token_worker.finished.connect(self._on_tree_population_finished)
         self._token_worker.error.connect(self._on_tree_population_error)
 
         self._token_worker.finished.connect(self._token_thread.quit)
         self._token_worker.error.connect(self._token_thread.quit)
+        # QThread.quit() is thread-safe; calling it directly from the worker
+        # also ends the thread when the GUI loop is no longer running.
+        self._token_worker.cancelled.connect(
+            self._token_thread.quit, Qt.ConnectionType.DirectConnection
+        )
         
         _thread_to_del = self._token_thread
         _worker_to_del = self._token_worker
@@ -841,7 +1090,12 @@ class WorkspaceTab(QWidget):
                 pass
         self._token_thread.finished.connect(_cleanup_thread)
 
-        self._progress_dlg.canceled.connect(self._token_worker.cancel)
+        # Direct connection: the worker's thread is busy inside run() and would
+        # not process a queued cancel until the walk had already finished.
+        self._progress_dlg.canceled.connect(
+            self._token_worker.cancel, Qt.ConnectionType.DirectConnection
+        )
+        self._progress_dlg.canceled.connect(self._expand_tree_root)
 
         self._token_thread.start()
 
@@ -850,84 +1104,134 @@ class WorkspaceTab(QWidget):
             self._progress_dlg.setMaximum(total)
             self._progress_dlg.setValue(current)
 
-    def _on_tree_item_ready(self, abs_path: str, is_dir: bool, token_count: int):
-        norm = os.path.normpath(abs_path)
-        parent_norm = os.path.normpath(os.path.dirname(norm))
+    def _clear_tree(self):
+        self.tree.clear()
+        self._hidden_items = []
+        self._path_to_item = {}
+        # Queued marks would point at rows that no longer exist.
+        self._pending_rule_marks = {}
+
+    def _on_tree_items_ready(self, batch: list):
+        # Rows are built detached and attached with one addChildren() per
+        # parent, so the model announces one row insertion per parent per batch
+        # instead of one per row; with uniform row heights the view then lays
+        # out only the slice that is actually on screen.
+        children_by_parent: dict = {}
+        tokens_by_parent: dict = {}
+        new_items: list = []
+        new_hidden: list = []
+        for abs_path, is_dir, token_count in batch:
+            built = self._build_tree_item(abs_path, is_dir, token_count)
+            if built is None:
+                continue
+            parent_item, item, tokens = built
+            children_by_parent.setdefault(parent_item, []).append(item)
+            new_items.append(item)
+            if tokens is not None:
+                tokens_by_parent[parent_item] = tokens_by_parent.get(parent_item, 0) + tokens
+            elif item.data(0, HIDDEN_ROLE):
+                new_hidden.append(item)
+
+        # Attaching rows, rolling up totals and marking rules all touch visible
+        # cells; with painting suspended the batch costs one repaint in total.
+        with self._tree_updates_suspended():
+            for parent_item, children in children_by_parent.items():
+                parent_item.addChildren(children)
+            # setHidden() needs the row to be in the view, so it waits for the attach.
+            for item in new_hidden:
+                item.setHidden(not self._show_hidden_dirs)
+            # One ancestor walk per parent per batch rather than one per file.
+            for parent_item, tokens in tokens_by_parent.items():
+                self._add_tokens_to_ancestors(parent_item, tokens)
+            self._update_tree_visuals_for_items(new_items)
+
+    def _build_tree_item(self, abs_path: str, is_dir: bool, token_count: int):
+        """Creates the detached row for one worker entry.
+
+        Returns (parent_item, item, tokens) or None when there is nothing to add;
+        tokens is the file's count to roll up into its ancestors, else None.
+        """
+        # TreeTokenWorker only emits normalised paths, so this per-item slot
+        # skips normpath; dirname of a normalised path is itself normalised.
+        norm = abs_path
+        parent_item = self._path_to_item.get(os.path.dirname(norm))
+        if parent_item is None:
+            return None
 
         if is_dir:
             if norm in self._path_to_item:
-                return  
-            parent_item = self._path_to_item.get(parent_norm)
-            if parent_item is None:
-                return
+                return None
 
             if token_count == TreeTokenWorker.TOKENS_TREE_HIDDEN:
-                item = QTreeWidgetItem(parent_item,[f"🚫 {os.path.basename(norm)}"])
+                item = QTreeWidgetItem([f"🚫 {os.path.basename(norm)}"])
                 item.setData(0, Qt.ItemDataRole.UserRole, (norm, True))
                 item.setData(0, TOKEN_ROLE, 0)
                 item.setData(0, HIDDEN_ROLE, True)
-                item.setForeground(0, item.foreground(0))  
-                grey_brush = QBrush(QColor(120, 120, 120))
                 for col in range(self.tree.columnCount()):
-                    item.setForeground(col, grey_brush)
+                    item.setForeground(col, self.HIDDEN_DIR_BRUSH)
                 item.setText(2, "✓")   
                 item.setText(3, "—")
-                item.setToolTip(0, "Tree-blacklisted: hidden from directory tree output")
-                item.setHidden(not self._show_hidden_dirs)
+                item.setToolTip(0, self.HIDDEN_DIR_TOOLTIP)
+                self._hidden_items.append(item)
+                self._path_to_item[norm] = item
             elif token_count == TreeTokenWorker.TOKENS_LARGE_DIR:
-                item = QTreeWidgetItem(parent_item, [f"📁 {os.path.basename(norm)}"])
+                item = QTreeWidgetItem([f"📁 {os.path.basename(norm)}"])
                 item.setData(0, Qt.ItemDataRole.UserRole, (norm, True))
                 item.setData(0, TOKEN_ROLE, 0)
                 item.setText(3, "⚠ Large")
-                item.setToolTip(3, f"Skipped: >{TreeTokenWorker.LARGE_DIR_THRESHOLD} files in subtree")
+                item.setToolTip(3, self.LARGE_DIR_TOOLTIP)
                 self._path_to_item[norm] = item
             else:
-                item = QTreeWidgetItem(parent_item, [f"📁 {os.path.basename(norm)}"])
+                item = QTreeWidgetItem([f"📁 {os.path.basename(norm)}"])
                 item.setData(0, Qt.ItemDataRole.UserRole, (norm, True))
                 item.setData(0, TOKEN_ROLE, 0)
                 self._path_to_item[norm] = item
-
-        else:
-            parent_item = self._path_to_item.get(parent_norm)
-            if parent_item is None:
-                return
-
-            parent_is_large = (parent_item.text(3) == "⚠ Large")
-
-            ext = os.path.splitext(norm)[1].lower()
-            item = QTreeWidgetItem(parent_item, [f"📄 {os.path.basename(norm)}"])
-            item.setData(0, Qt.ItemDataRole.UserRole, (norm, False))
-
-            if parent_is_large or token_count == TreeTokenWorker.TOKENS_LARGE_DIR:
-                item.setData(0, TOKEN_ROLE, 0)
-                item.setText(3, "—")
-            else:
-                if ext not in app_config.LANG_MAP:
-                    token_count = 0
-                item.setData(0, TOKEN_ROLE, token_count)
-                item.setText(3, f"{token_count:,}" if token_count else "—")
-
-                p = parent_item
-                while p is not None:
-                    existing = p.data(0, TOKEN_ROLE) or 0
-                    p.setData(0, TOKEN_ROLE, existing + token_count)
-                    p_tok = p.data(0, TOKEN_ROLE) or 0
-                    if p.text(3) != "⚠ Large":
-                        p.setText(3, f"{p_tok:,}" if p_tok else "—")
-                    p = p.parent()
-
-
-        self._update_tree_visuals_for_items([item])
-
+            return parent_item, item, None
+
+        parent_is_large = (parent_item.text(3) == "⚠ Large")
+
+        ext = os.path.splitext(norm)[1].lower()
+        item = QTreeWidgetItem([f"📄 {os.path.basename(norm)}"])
+        item.setData(0, Qt.ItemDataRole.UserRole, (norm, False))
+        self._path_to_item[norm] = item
+
+        if parent_is_large or token_count == TreeTokenWorker.TOKENS_LARGE_DIR:
+            item.setData(0, TOKEN_ROLE, 0)
+            item.setText(3, "—")
+            return parent_item, item, None
+
+        if ext not in app_config.LANG_MAP:
+            token_count = 0
+        item.setData(0, TOKEN_ROLE, token_count)
+        item.setText(3, f"{token_count:,}" if token_count else "—")
+        return parent_item, item, token_count
+
+    @staticmethod
+    def _add_tokens_to_ancestors(parent_item: QTreeWidgetItem, tokens: int):
+        p = parent_item
+        while p is not None:
+            p_tok = (p.data(0, TOKEN_ROLE) or 0) + tokens
+            p.setData(0, TOKEN_ROLE, p_tok)
+            if p.text(3) != "⚠ Large":
+                p.setText(3, f"{p_tok:,}" if p_tok else "—")
+            p = p.parent()
 
     def _on_tree_population_finished(self, tree_tokens: int):
         self._progress_dlg.close()
+        self._expand_tree_root()
         self._tree_tokens = tree_tokens
-        self._update_all_tree_visuals()
-        self._recalculate_token_labels()
+        # No full re-mark pass: each row was marked when it was inserted, and
+        # rule changes since then re-marked exactly the rows they touched.
+        self._schedule_token_recalc()
+
+    def _expand_tree_root(self):
+        root_item = self.tree.topLevelItem(0)
+        if root_item is not None:
+            root_item.setExpanded(True)
 
     def _on_tree_population_error(self, error_msg: str):
         self._progress_dlg.close()
+        self._expand_tree_root()
         QMessageBox.critical(self, "Tree Load Error", f"Error loading directory tree:\n{error_msg}")
 
     # ------------------------------------------------------------------
@@ -940,22 +1244,27 @@ class WorkspaceTab(QWidget):
     def _toggle_show_hidden_dirs(self, checked: bool):
         self._show_hidden_dirs = checked
         self.show_hidden_btn.setText("👁 Hide Hidden Dirs" if checked else "👁 Show Hidden Dirs")
-        it = QTreeWidgetItemIterator(self.tree)
-        while it.value():
-            item = it.value()
-            if item.data(0, HIDDEN_ROLE):
+        with self._tree_updates_suspended():
+            for item in self._hidden_items:
                 item.setHidden(not checked)
-            it += 1
 
     # ------------------------------------------------------------------
     # Rule application
     # ------------------------------------------------------------------
 
-    def _get_item_and_all_descendants(self, start_item: QTreeWidgetItem) -> set:
-        result = set()
+    def _get_item_and_all_descendants(self, start_item: QTreeWidgetItem, result: set | None = None) -> set:
+        """Adds *start_item* and its subtree to *result* (a new set if omitted), iteratively.
+
+        A row already in *result* had its whole subtree collected with it, so
+        it is not descended into again.
+        """
+        if result is None:
+            result = set()
         stack = [start_item]
         while stack:
             cur = stack.pop()
+            if cur in result:
+                continue
             result.add(cur)
             for i in range(cur.childCount()):
                 stack.append(cur.child(i))
@@ -966,8 +1275,11 @@ class WorkspaceTab(QWidget):
         if not selected:
             return
 
+        # Each row's (path, is_dir) is fetched from Qt once and reused for the
+        # rule update and the visual refresh below.
         if rule_type == 'tree_blacklist':
             changed = False
+            rows = []
             for item in selected:
                 data = item.data(0, Qt.ItemDataRole.UserRole)
                 if not data:
@@ -975,65 +1287,119 @@ class WorkspaceTab(QWidget):
                 full_path, is_dir = data
                 if not is_dir:
                     continue
+                rows.append((item, full_path, is_dir))
                 if action == 'add' and full_path not in self.directory_tree_blacklist:
-                    self.directory_tree_blacklist.append(full_path)
+                    self.directory_tree_blacklist[full_path] = None
                     changed = True
                 elif action == 'remove' and full_path in self.directory_tree_blacklist:
-                    self.directory_tree_blacklist.remove(full_path)
+                    del self.directory_tree_blacklist[full_path]
                     changed = True
             if changed:
                 self._set_dirty(True)
-                all_affected: set = set()
-                for item in selected:
-                    all_affected.update(self._get_item_and_all_descendants(item))
-                self._update_tree_visuals_for_items(all_affected)
-                self._recalculate_token_labels()
+                # A blacklist mark belongs to its own row only, and the token
+                # labels do not depend on it, so only the selected rows change.
+                self._queue_rule_marks(rows)
             return
 
         items_to_process: set = set()
         for item in selected:
-            items_to_process.update(self._get_item_and_all_descendants(item))
+            self._get_item_and_all_descendants(item, items_to_process)
 
+        # Collect the whole selection first, then apply it as one set update per
+        # rule kind and signal dirtiness once rather than once per item.
+        file_paths: set = set()
+        folder_paths: set = set()
+        rows = []
         for item in items_to_process:
             data = item.data(0, Qt.ItemDataRole.UserRole)
             if not data:
                 continue
             full_path, is_dir = data
+            rows.append((item, full_path, is_dir))
+            (folder_paths if is_dir else file_paths).add(full_path)
 
-            target = self.rules_folders if is_dir else self.rules_files
-            if action == 'add' and full_path not in target:
-                target.append(full_path)
-            elif action == 'remove' and full_path in target:
-                target.remove(full_path)
-            self._set_dirty(True)
+        if not file_paths and not folder_paths:
+            return
+        if action == 'add':
+            self.rules_files |= file_paths
+            self.rules_folders |= folder_paths
+        else:
+            self.rules_files -= file_paths
+            self.rules_folders -= folder_paths
+        self._set_dirty(True)
 
-        self._update_tree_visuals_for_items(items_to_process)
-        self._recalculate_token_labels()
+        self._queue_rule_marks(rows)
+        self._schedule_token_recalc()
 
     # ------------------------------------------------------------------
     # Tree visuals
     # ------------------------------------------------------------------
 
+    @contextmanager
+    def _tree_updates_suspended(self):
+        """Defers tree repaints until a bulk mutation finishes, then repaints once."""
+        self.tree.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.tree.setUpdatesEnabled(True)
+
     def _update_tree_visuals_for_items(self, items):
         for item in items:
             data = item.data(0, Qt.ItemDataRole.UserRole)
-            if not data:
-                continue
-            full_path, is_dir = data
-            is_rule = (full_path in self.rules_folders) if is_dir else (full_path in self.rules_files)
-            item.setText(1, "✓" if is_rule else "")
-            is_bl = is_dir and full_path in self.directory_tree_blacklist
-            item.setText(2, "✓" if is_bl else "")
-
-    def _update_all_tree_visuals(self):
-        if self.tree.topLevelItemCount() == 0:
+            if data:
+                self._set_rule_marks(item, *data)
+
+    def _queue_rule_marks(self, rows):
+        """Defers re-marking (item, path, is_dir) rows to one flush per event-loop pass.
+
+        The click handler returns at once, and rows touched by several rule
+        operations in a row are painted once, from the rule sets as they
+        stand when the flush runs.
+        """
+        for item, full_path, is_dir in rows:
+            self._pending_rule_marks[item] = (full_path, is_dir)
+        if not self._rule_marks_flush_pending:
+            self._rule_marks_flush_pending = True
+            QTimer.singleShot(0, self._flush_rule_marks)
+
+    def _flush_rule_marks(self):
+        self._rule_marks_flush_pending = False
+        pending, self._pending_rule_marks = self._pending_rule_marks, {}
+        if not pending:
             return
-        all_items =[]
-        it = QTreeWidgetItemIterator(self.tree)
-        while it.value():
-            all_items.append(it.value())
-            it += 1
-        self._update_tree_visuals_for_items(all_items)
+        with self._tree_updates_suspended():
+            for item, (full_path, is_dir) in pending.items():
+                self._set_rule_marks(item, full_path, is_dir)
+
+    def _set_rule_marks(self, item: QTreeWidgetItem, full_path: str, is_dir: bool):
+        is_rule = (full_path in self.rules_folders) if is_dir else (full_path in self.rules_files)
+        is_bl = is_dir and full_path in self.directory_tree_blacklist
+        # Only touch cells whose mark actually changes: every setText on a
+        # fresh cell emits a model change and schedules a repaint.
+        rule_mark = "✓" if is_rule else ""
+        if item.text(1) != rule_mark:
+            item.setText(1, rule_mark)
+        bl_mark = "✓" if is_bl else ""
+        if item.text(2) != bl_mark:
+            item.setText(2, bl_mark)
+
+    def _refresh_changed_rule_marks(self, old_files, old_folders, old_blacklist):
+        """Re-marks only the rows whose path entered or left a rule set.
+
+        A row's marks depend only on its own path's membership, so after a
+        rules reload just the symmetric differences need visiting instead of
+        the whole tree.
+        """
+        changed = (
+            (old_files ^ self.rules_files)
+            | (old_folders ^ self.rules_folders)
+            | (old_blacklist.keys() ^ self.directory_tree_blacklist.keys())
+        )
+        items = [self._path_to_item[p] for p in changed if p in self._path_to_item]
+        if items:
+            with self._tree_updates_suspended():
+                self._update_tree_visuals_for_items(items)
 
     # ------------------------------------------------------------------
     # Token label helpers
@@ -1045,23 +1411,26 @@ class WorkspaceTab(QWidget):
         self.lbl_scan_tokens.setText("Scan: — tk")
         self.lbl_total_tokens.setText("Total: — tk")
 
+    def _schedule_token_recalc(self):
+        """Coalesces back-to-back rule changes into one full-tree token pass."""
+        if not self._token_recalc_pending:
+            self._token_recalc_pending = True
+            QTimer.singleShot(0, self._recalculate_token_labels)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._token_labels_stale:
+            self._schedule_token_recalc()
+
     def _recalculate_token_labels(self):
-        scan_tokens = 0
-        it = QTreeWidgetItemIterator(self.tree)
-        while it.value():
-            item = it.value()
-            data = item.data(0, Qt.ItemDataRole.UserRole)
-            if data:
-                full_path, is_dir = data
-                if not is_dir:
-                    if scan_engine.should_process_item(
-                        full_path, True,
-                        self.rules_files, self.rules_folders,
-                        self.filter_mode,[]
-                    ):
-                        tok = item.data(0, TOKEN_ROLE) or 0
-                        scan_tokens += tok
-            it += 1
+        self._token_recalc_pending = False
+        # A background tab only records that its labels are out of date;
+        # the tree walk runs once when the tab is shown again.
+        if not self.isVisible():
+            self._token_labels_stale = True
+            return
+        self._token_labels_stale = False
+        scan_tokens = self._scan_token_total()
 
         tree_tok = self._tree_tokens if self.generate_tree_check.isChecked() else 0
         total = tree_tok + scan_tokens
@@ -1069,6 +1438,52 @@ class WorkspaceTab(QWidget):
         self.lbl_scan_tokens.setText(f"Scan: {scan_tokens:,} tk")
         self.lbl_total_tokens.setText(f"Total: {total:,} tk")
 
+    def _scan_token_total(self) -> int:
+        """Sums the token counts of the files the current rules would scan.
+
+        Mirrors should_process_item() without per-file ancestor walks: the
+        tree is walked top-down and each directory inherits whether a folder
+        rule already excludes it, so a folder rule costs one set lookup per
+        directory instead of O(depth) lookups per file.
+        """
+        blacklist = self.filter_mode == app_config.FILTER_BLACKLIST
+        rules_files = self.rules_files
+        folders = self.rules_folders if blacklist else frozenset()
+        # The per-file test is picked once for the filter mode, so the loop
+        # below makes a single call per file with no mode branching.
+        if blacklist:
+            def file_included(path):
+                return path not in rules_files
+        elif self.filter_mode == app_config.FILTER_WHITELIST:
+            file_included = rules_files.__contains__
+        else:
+            def file_included(path):
+                return True
+
+        stack = []
+        for i in range(self.tree.topLevelItemCount()):
+            top = self.tree.topLevelItem(i)
+            data = top.data(0, Qt.ItemDataRole.UserRole)
+            excluded = bool(data) and bool(folders) and scan_engine.folder_at_or_above(data[0], folders)
+            stack.append((top, excluded))
+
+        total = 0
+        while stack:
+            item, excluded = stack.pop()
+            for i in range(item.childCount()):
+                child = item.child(i)
+                data = child.data(0, Qt.ItemDataRole.UserRole)
+                if not data:
+                    stack.append((child, excluded))
+                    continue
+                full_path, is_dir = data
+                if is_dir:
+                    stack.append((child, excluded or full_path in folders))
+                    continue
+                if not excluded and file_included(full_path):
+                    total += child.data(0, TOKEN_ROLE) or 0
+        return total
+
     # ------------------------------------------------------------------
     # Scan execution
     # ------------------------------------------------------------------
@@ -1088,41 +1503,83 @@ class WorkspaceTab(QWidget):
                 QMessageBox.critical(self, "Input Error", f"Could not create save directory:\n{save_dir}\nError: {e}")
                 return
 
-        self.run_scan_btn.setEnabled(False)
-        self.run_copy_btn.setEnabled(False)
-        self.run_json_btn.setEnabled(False)
+        self._set_scan_running(True)
 
         scan_params = {
-            'scan_dir_norm': os.path.normpath(self.scan_dir_entry.text()),
-            'save_path_norm': os.path.normpath(save_path),
-            'rules_files': list(self.rules_files),
-            'rules_folders': list(self.rules_folders),
+            'scan_dir_norm': _norm(self.scan_dir_entry.text()),
+            'save_path_norm': _norm(save_path),
+            # Read-only snapshots for the worker thread; frozensets keep the
+            # engine's per-entry `in` tests O(1).
+            'rules_files': frozenset(self.rules_files),
+            'rules_folders': frozenset(self.rules_folders),
             'filter_mode': self.filter_mode,
             'rules_path_display': self.current_rules_filepath,
             'rules_dirty': self.rules_dirty,
             'generate_tree': self.generate_tree_check.isChecked(),
-            'tree_blacklist': list(self.directory_tree_blacklist),
+            'tree_blacklist': self._tree_blacklist_snapshot(),
             'copy_to_clipboard': copy_to_clipboard,
         }
 
+        self._start_scan_worker(scan_params)
+
+    def _tree_blacklist_snapshot(self) -> frozenset:
+        """The blacklist is only read while writing the tree, so skip the copy when it is off."""
+        if not self.generate_tree_check.isChecked():
+            return frozenset()
+        return frozenset(self.directory_tree_blacklist)
+
+    def _start_scan_worker(self, scan_params: dict):
         self._scan_thread = QThread(self)
-        self._scan_worker = ScanWorker(scan_params)
+        self._scan_worker = ScanWorker(scan_params, self._scan_progress)
         self._scan_worker.moveToThread(self._scan_thread)
 
         self._scan_thread.started.connect(self._scan_worker.run)
         self._scan_worker.scan_finished.connect(self._on_scan_complete)
         self._scan_worker.scan_error.connect(self._on_scan_error)
-        self._scan_worker.status_update.connect(
-            lambda msg: self.window()._update_status(msg) if hasattr(self.window(), '_update_status') else None
-        )
+        self._scan_worker.scan_cancelled.connect(self._on_scan_cancelled)
+        # Resolve the status slot once per scan rather than per progress message.
+        self._status_slot = getattr(self.window(), '_update_status', None)
 
         self._scan_worker.scan_finished.connect(self._scan_thread.quit)
         self._scan_worker.scan_error.connect(self._scan_thread.quit)
+        self._scan_worker.scan_cancelled.connect(self._scan_thread.quit)
         self._scan_thread.finished.connect(self._scan_worker.deleteLater)
         self._scan_thread.finished.connect(self._scan_thread.deleteLater)
 
+        self._scan_progress_timer.start()
         self._scan_thread.start()
 
+    def _set_scan_running(self, running: bool):
+        self.run_scan_btn.setEnabled(not running)
+        self.run_copy_btn.setEnabled(not running)
+        self.run_json_btn.setEnabled(not running)
+        self.cancel_scan_btn.setEnabled(running)
+
+    def _cancel_scan(self):
+        # ScanWorker.cancel() only sets a threading.Event, so it is called
+        # directly rather than queued to the busy worker thread.
+        if self._scan_worker is not None:
+            try:
+                self._scan_worker.cancel()
+            except RuntimeError:
+                pass
+        self.cancel_scan_btn.setEnabled(False)
+
+    def _drain_scan_progress(self):
+        """Shows only the newest queued scan status; called on a 50 ms timer."""
+        latest = None
+        while True:
+            try:
+                latest = self._scan_progress.get_nowait()
+            except queue.Empty:
+                break
+        if latest is not None and self._status_slot is not None:
+            self._status_slot(latest)
+
+    def _stop_scan_progress(self):
+        self._scan_progress_timer.stop()
+        self._drain_scan_progress()
+
     def _run_json_scan(self):
         """Executes a targeted whitelist scan dynamically populated by parsed JSON filenames."""
         ok, msg = self.validate_for_scan()
@@ -1130,6 +1587,7 @@ class WorkspaceTab(QWidget):
             QMessageBox.critical(self, "Input Error", msg)
             return
 
+        from dialogs_qt.QtJsonScanDialog import QtJsonScanDialog
         dialog = QtJsonScanDialog(self)
         if not dialog.exec():
             return
@@ -1137,11 +1595,11 @@ class WorkspaceTab(QWidget):
         req_files_lower = {f.lower() for f in dialog.req_files}
         found_files = {}
 
-        scan_dir = os.path.normpath(self.scan_dir_entry.text())
-        tree_blacklist = {os.path.normpath(p) for p in self.directory_tree_blacklist}
+        scan_dir = _norm(self.scan_dir_entry.text())
+        tree_blacklist = self.directory_tree_blacklist
         
         self._load_default_ignore_patterns()
-        folder_patterns = self.default_ignore_patterns.get('folder',[])
+        folder_re = rule_manager.compile_name_patterns(self.default_ignore_patterns.get('folder', []))
 
         # Traverse directory, actively skipping blacklisted/ignored paths in-place
         for root, dirs, files in os.walk(scan_dir):
@@ -1149,14 +1607,14 @@ class WorkspaceTab(QWidget):
             
             dirs[:] =[
                 d for d in dirs
-                if os.path.normpath(os.path.join(norm_root, d)) not in tree_blacklist
-                and not any(fnmatch.fnmatch(d, p) for p in folder_patterns)
+                if os.path.join(norm_root, d) not in tree_blacklist
+                and not rule_manager.matches_name_patterns(folder_re, d)
             ]
 
             for f in files:
                 f_lower = f.lower()
                 if f_lower in req_files_lower and f_lower not in found_files:
-                    found_files[f_lower] = os.path.normpath(os.path.join(norm_root, f))
+                    found_files[f_lower] = os.path.join(norm_root, f)
                     
             if len(found_files) == len(req_files_lower):
                 break
@@ -1187,50 +1645,31 @@ class WorkspaceTab(QWidget):
                 QMessageBox.critical(self, "Input Error", f"Could not create save directory:\n{save_dir}\nError: {e}")
                 return
 
-        self.run_scan_btn.setEnabled(False)
-        self.run_copy_btn.setEnabled(False)
-        self.run_json_btn.setEnabled(False)
+        self._set_scan_running(True)
 
         # Build scan parameters targeting only the found matches
         scan_params = {
             'scan_dir_norm': scan_dir,
-            'save_path_norm': os.path.normpath(save_path),
-            'rules_files': list(found_files.values()),
-            'rules_folders':[],
+            'save_path_norm': _norm(save_path),
+            'rules_files': frozenset(found_files.values()),
+            'rules_folders': frozenset(),
             'filter_mode': app_config.FILTER_WHITELIST,
             'rules_path_display': "Targeted JSON Scan",
             'rules_dirty': False,
             'generate_tree': self.generate_tree_check.isChecked(),
-            'tree_blacklist': list(self.directory_tree_blacklist),
+            'tree_blacklist': self._tree_blacklist_snapshot(),
             'copy_to_clipboard': False,
         }
 
-        self._scan_thread = QThread(self)
-        self._scan_worker = ScanWorker(scan_params)
-        self._scan_worker.moveToThread(self._scan_thread)
-
-        self._scan_thread.started.connect(self._scan_worker.run)
-        self._scan_worker.scan_finished.connect(self._on_scan_complete)
-        self._scan_worker.scan_error.connect(self._on_scan_error)
-        self._scan_worker.status_update.connect(
-            lambda msg: self.window()._update_status(msg) if hasattr(self.window(), '_update_status') else None
-        )
-
-        self._scan_worker.scan_finished.connect(self._scan_thread.quit)
-        self._scan_worker.scan_error.connect(self._scan_thread.quit)
-        self._scan_thread.finished.connect(self._scan_worker.deleteLater)
-        self._scan_thread.finished.connect(self._scan_thread.deleteLater)
-
-        self._scan_thread.start()
+        self._start_scan_worker(scan_params)
 
     def _on_scan_complete(self, save_path: str):
-        self.run_scan_btn.setEnabled(True)
-        self.run_copy_btn.setEnabled(True)
-        self.run_json_btn.setEnabled(True)
+        self._stop_scan_progress()
+        self._set_scan_running(False)
 
         p = self._scan_worker.scan_params
-        if hasattr(self.window(), '_update_status'):
-            self.window()._update_status(f"Scan complete. Output saved to: {save_path}", 10000)
+        if self._status_slot is not None:
+            self._status_slot(f"Scan complete. Output saved to: {save_path}", 10000)
 
         if p.get('copy_to_clipboard'):
             try:
@@ -1246,14 +1685,43 @@ class WorkspaceTab(QWidget):
             QMessageBox.information(self, "Scan Complete", f"Output successfully saved to:\n{save_path}")
 
     def _on_scan_error(self, error_msg: str, tb: str):
-        self.run_scan_btn.setEnabled(True)
-        self.run_copy_btn.setEnabled(True)
-        self.run_json_btn.setEnabled(True)
-        if hasattr(self.window(), '_update_status'):
-            self.window()._update_status(f"Error during scan: {error_msg}", 10000)
-        print(f"Full scan error:\n{tb}")
+        self._stop_scan_progress()
+        self._set_scan_running(False)
+        if self._status_slot is not None:
+            self._status_slot(f"Error during scan: {error_msg}", 10000)
+        logger.error(f"Full scan error:\n{tb}")
         QMessageBox.critical(self, "Scan Error", f"An error occurred:\n{error_msg}\nSee console for details.")
 
+    def _on_scan_cancelled(self):
+        self._stop_scan_progress()
+        self._set_scan_running(False)
+        if self._status_slot is not None:
+            self._status_slot("Scan cancelled.", 5000)
+
+    # Upper bound on how long closing a tab/window waits for each worker thread.
+    THREAD_STOP_TIMEOUT_MS = 3000
+
+    def cancel_background_work(self):
+        """Stops this tab's running scan and tree population and waits for their threads, e.g. when the tab is closed."""
+        for worker in (self._scan_worker, self._token_worker):
+            if worker is not None:
+                try:
+                    worker.cancel()
+                except RuntimeError:
+                    pass
+        # The workers check their cancel events at every file, so the wait is
+        # short. quit() is called here because the worker's own queued quit is
+        # never delivered once the GUI event loop has stopped.
+        for thread in (self._scan_thread, self._token_thread):
+            if thread is None:
+                continue
+            try:
+                if thread.isRunning():
+                    thread.quit()
+                    thread.wait(self.THREAD_STOP_TIMEOUT_MS)
+            except RuntimeError:
+                pass  # already deleted after finishing normally
+
 
 # ---------------------------------------------------------------------------
 # CodeScannerApp – Main Window
@@ -1261,6 +1729,24 @@ class WorkspaceTab(QWidget):
 
 MAX_TABS = 3
 
+# Characters not allowed in profile names (anything but alphanumerics, space, '_' and '-').
+_PROFILE_NAME_INVALID = re.compile(r"[^\w \-]+")
+
+# Menu bar layout: (menu title, entries). Each entry is
+# (label, handler method name, shortcut, attribute to keep the QAction on),
+# or None for a separator.
+MENU_SPEC = (
+    ("Profiles", (
+        ("Update Current Profile", "_update_current_profile", None, "update_profile_action"),
+        ("Save Profile As…", "_save_profile_dialog", None, None),
+        None,
+        ("Manage Profiles…", "_manage_profiles_dialog", None, None),
+    )),
+    ("Workspace", (
+        ("New Tab", "_add_tab", "Ctrl+T", "new_tab_action"),
+    )),
+)
+
 
 class CodeScannerApp(QMainWindow):
     def __init__(self):
@@ -1271,6 +1757,8 @@ class CodeScannerApp(QMainWindow):
 
         self.profiles, self.last_active_profile_name = profile_handler.load_profiles(app_config.PROFILES_PATH)
         self.last_active_profile_name: str | None = self.last_active_profile_name
+        self._pending_status: tuple[str, int] | None = None
+        self._title_refresh_pending = False
 
         self._setup_ui()
         self._open_initial_tab()
@@ -1281,7 +1769,7 @@ class CodeScannerApp(QMainWindow):
     # ------------------------------------------------------------------
 
     def _setup_ui(self):
-        self.setStyleSheet(DARK_THEME_STYLESHEET)
+        _ensure_stylesheet()
         self._setup_menu()
 
         self.tab_widget = QTabWidget()
@@ -1295,33 +1783,49 @@ class CodeScannerApp(QMainWindow):
 
     def _setup_menu(self):
         menubar = self.menuBar()
-
-        # Profiles menu
-        profile_menu = menubar.addMenu("Profiles")
-        self.update_profile_action = profile_menu.addAction("Update Current Profile", self._update_current_profile)
-        profile_menu.addAction("Save Profile As…", self._save_profile_dialog)
-        profile_menu.addSeparator()
-        profile_menu.addAction("Manage Profiles…", self._manage_profiles_dialog)
-
-        # Workspace menu
-        ws_menu = menubar.addMenu("Workspace")
-        self.new_tab_action = ws_menu.addAction("New Tab", self._add_tab)
-        self.new_tab_action.setShortcut("Ctrl+T")
+        for title, entries in MENU_SPEC:
+            menu = menubar.addMenu(title)
+            for entry in entries:
+                if entry is None:
+                    menu.addSeparator()
+                    continue
+                label, handler_name, shortcut, attr_name = entry
+                action = menu.addAction(label, getattr(self, handler_name))
+                if shortcut:
+                    action.setShortcut(shortcut)
+                if attr_name:
+                    setattr(self, attr_name, action)
 
     # ------------------------------------------------------------------
     # Tab helpers
     # ------------------------------------------------------------------
 
     def _open_initial_tab(self):
-        tab = self._create_tab()
+        self._create_tab()
+        self._update_new_tab_action()
         if self.last_active_profile_name and self.last_active_profile_name in self.profiles:
-            tab.apply_profile_settings(self.last_active_profile_name, self.profiles)
+            # Applying a profile reads its rules file and starts a tree load;
+            # run it on the first event-loop pass so the window paints first.
+            self._update_status("Loading profile…")
+            QTimer.singleShot(0, self._apply_initial_profile)
+
+    def _apply_initial_profile(self):
+        tab = self.tab_widget.widget(0)
+        # The user may already have picked another profile or closed the tab.
+        if not isinstance(tab, WorkspaceTab) or tab.active_profile_name:
+            return
+        profile_name = self.last_active_profile_name
+        if profile_name not in self.profiles:
+            return
+        if tab.apply_profile_settings(profile_name, self.profiles):
             self._refresh_tab_title(0)
-        self._update_new_tab_action()
+            self._update_window_title()
+            self._update_profile_menu_state()
+            self._update_status(f"Profile '{profile_name}' loaded.", 3000)
 
     def _create_tab(self) -> "WorkspaceTab":
         tab = WorkspaceTab(self.profiles, parent=self)
-        tab.dirty_changed.connect(lambda _: self._refresh_current_tab_title())
+        tab.dirty_changed.connect(lambda _: self._schedule_title_refresh())
         idx = self.tab_widget.addTab(tab, "New Tab")
         self.tab_widget.setCurrentIndex(idx)
         return tab
@@ -1348,11 +1852,21 @@ class CodeScannerApp(QMainWindow):
             )
             if reply == QMessageBox.StandardButton.No:
                 return
+        tab.cancel_background_work()
         self.tab_widget.removeTab(index)
         if self.tab_widget.count() == 0:
             self._create_tab()
         self._update_new_tab_action()
 
+    def closeEvent(self, event):
+        # Stop in-flight scans/tree loads so their threads are not left
+        # reading files for a window that is going away.
+        for i in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(i)
+            if isinstance(tab, WorkspaceTab):
+                tab.cancel_background_work()
+        super().closeEvent(event)
+
     def _update_new_tab_action(self):
         self.new_tab_action.setEnabled(self.tab_widget.count() < MAX_TABS)
 
@@ -1368,7 +1882,14 @@ class CodeScannerApp(QMainWindow):
         dirty = " *" if tab.rules_dirty else ""
         self.tab_widget.setTabText(index, f"{name}{dirty}")
 
+    def _schedule_title_refresh(self):
+        """Collapses a burst of dirty-state changes into one tab/window title update."""
+        if not self._title_refresh_pending:
+            self._title_refresh_pending = True
+            QTimer.singleShot(0, self._refresh_current_tab_title)
+
     def _refresh_current_tab_title(self):
+        self._title_refresh_pending = False
         idx = self.tab_widget.currentIndex()
         if idx >= 0:
             self._refresh_tab_title(idx)
@@ -1383,6 +1904,17 @@ class CodeScannerApp(QMainWindow):
     # ------------------------------------------------------------------
 
     def _update_status(self, message: str, clear_after_ms: int = 0):
+        """Queues a status message; only the latest one per event-loop pass is painted."""
+        flush_scheduled = self._pending_status is not None
+        self._pending_status = (message, clear_after_ms)
+        if not flush_scheduled:
+            QTimer.singleShot(0, self._flush_status)
+
+    def _flush_status(self):
+        if self._pending_status is None:
+            return
+        message, clear_after_ms = self._pending_status
+        self._pending_status = None
         self.status_bar.showMessage(message, clear_after_ms)
 
     def _update_window_title(self):
@@ -1424,7 +1956,7 @@ class CodeScannerApp(QMainWindow):
         name, ok = QInputDialog.getText(self, "Save Profile As", "Enter a new profile name:")
         if not ok or not name:
             return
-        clean = "".join(c for c in name if c.isalnum() or c in (' ', '_', '-')).strip()
+        clean = _PROFILE_NAME_INVALID.sub("", name).strip()
         if not clean:
             QMessageBox.warning(self, "Invalid Name", "Profile name cannot be empty or only special characters.")
             return
@@ -1466,8 +1998,7 @@ class CodeScannerApp(QMainWindow):
         try:
             profile_handler.save_profiles(self.profiles, self.last_active_profile_name, app_config.PROFILES_PATH)
             tab._set_dirty(False)
-            self._refresh_current_tab_title()
-            self._update_window_title()
+            self._schedule_title_refresh()
             self._update_profile_menu_state()
             return True
         except Exception as e:
@@ -1475,6 +2006,7 @@ class CodeScannerApp(QMainWindow):
             return False
 
     def _manage_profiles_dialog(self):
+        from dialogs_qt.QtManageProfilesDialog import QtManageProfilesDialog
         tab = self._current_tab()
         active_name = tab.active_profile_name if tab else None
         dialog = QtManageProfilesDialog(self, self.profiles, active_name, self)
@@ -1487,12 +2019,8 @@ class CodeScannerApp(QMainWindow):
         result = tab.apply_profile_settings(profile_name, self.profiles)
         if result:
             self.last_active_profile_name = profile_name
-            try:
-                profile_handler.save_profiles(self.profiles, self.last_active_profile_name, app_config.PROFILES_PATH)
-            except Exception:
-                pass
-            self._refresh_current_tab_title()
-            self._update_window_title()
+            profile_handler.save_profiles_async(self.profiles, self.last_active_profile_name, app_config.PROFILES_PATH)
+            self._schedule_title_refresh()
             self._update_profile_menu_state()
             self._update_status(f"Profile '{profile_name}' loaded.", 3000)
         return result
@@ -1525,9 +2053,33 @@ class CodeScannerApp(QMainWindow):
 # Entry point
 # ---------------------------------------------------------------------------
 
+def _start_console_logging():
+    """
+    Sends app log records to the console from a background listener thread,
+    so a slow or blocked stdout never stalls the GUI thread. Returns the
+    started listener, or None when there is no console (windowed builds).
+    """
+    stream = sys.stdout or sys.stderr
+    if stream is None:
+        return None
+    console = logging.StreamHandler(stream)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    log_queue = queue.SimpleQueue()
+    root_logger = logging.getLogger()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    root_logger.setLevel(logging.INFO)
+    listener = logging.handlers.QueueListener(log_queue, console)
+    listener.start()
+    return listener
+
+
 if __name__ == "__main__":
+    log_listener = _start_console_logging()
     app = QApplication(sys.argv)
-    app.setStyleSheet(DARK_THEME_STYLESHEET)
+    _ensure_stylesheet()
     window = CodeScannerApp()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    exit_code = app.exec()
+    if log_listener is not None:
+        log_listener.stop()
+    sys.exit(exit_code)
\ No newline at end of file
@@ -1,6 +1,7 @@
 # CodebaseScanner/dialogs_qt/QtEditDefaultsDialog.py
 
 import os
+import logging
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
     QListWidget, QListWidgetItem, QLabel, QMessageBox, QDialogButtonBox,
@@ -8,6 +9,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+logger = logging.getLogger(__name__)
+
 class QtEditDefaultsDialog(QDialog):
     def __init__(self, parent, default_filepath_param, app_instance):
         super().__init__(parent)
@@ -95,7 +98,7 @@ class QtEditDefaultsDialog(QDialog):
                     f.write("# Default folders to ignore (name patterns, e.g., .git, node_modules)\n")
                     f.write("folder: .git\nfolder: .svn\nfolder: .hg\nfolder: .venv\nfolder: venv\n")
                     f.write("folder: node_modules\nfolder: __pycache__\nfolder: build\nfolder: dist\n")
-                print(f"Created default name patterns file: {self.default_filepath}")
+                logger.info(f"Created default name patterns file: {self.default_filepath}")
 
             with open(self.default_filepath, "r", encoding="utf-8") as f:
                 for line in f:
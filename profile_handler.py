@@ -2,36 +2,135 @@
 
 import os
 import json
+import logging
+import threading
+
+# orjson is an optional speed-up (not in requirements.txt); the stdlib json
+# path below must keep working on its own.
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _loads(raw: bytes):
+    return orjson.loads(raw) if _ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _dumps(data) -> bytes:
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    # orjson only supports 2-space indentation; match it so the file keeps one
+    # on-disk format whichever serialiser is installed.
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
 
 def load_profiles(profiles_path):
     """Loads profiles from PROFILES_PATH."""
-    if os.path.exists(profiles_path):
-        try:
-            with open(profiles_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # Ensure directory_tree_blacklist and generate_directory_tree are present
-                profiles_data = data.get("profiles", {})
-                for _, profile_content in profiles_data.items():
-                    profile_content.setdefault("directory_tree_blacklist", [])
-                    profile_content.setdefault("generate_directory_tree", True) # Default to True
-                return profiles_data, data.get("last_active_profile_name", None)
-        except Exception as e:
-            print(f"Error loading profiles from {profiles_path}: {e}")
-            # Errors will be handled by the GUI caller.
+    # Open directly rather than stat-then-open; a missing file is the common first-run case.
+    try:
+        with open(profiles_path, "rb") as f:
+            data = _loads(f.read())
+            # Ensure directory_tree_blacklist and generate_directory_tree are present
+            profiles_data = data.get("profiles", {})
+            for _, profile_content in profiles_data.items():
+                profile_content.setdefault("directory_tree_blacklist", [])
+                profile_content.setdefault("generate_directory_tree", True) # Default to True
+            return profiles_data, data.get("last_active_profile_name", None)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.error(f"Error loading profiles from {profiles_path}: {e}")
+        # Errors will be handled by the GUI caller.
     return {}, None
 
-def save_profiles(profiles, last_active_profile_name, profiles_path):
-    """Saves profiles and the last active profile name to PROFILES_PATH."""
-    try:
+# Saves are sequenced so that a background write can never clobber a newer one.
+_state_lock = threading.Lock()
+_write_lock = threading.Lock()
+_save_seq = 0
+_last_written_seq = 0
+_pending_save = None  # (seq, payload, profiles_path) awaiting the background writer
+_writer_thread = None
+
+
+def _next_save_seq() -> int:
+    global _save_seq
+    with _state_lock:
+        _save_seq += 1
+        return _save_seq
+
+
+def _write_payload(seq, payload, profiles_path):
+    global _last_written_seq
+    with _write_lock:
+        if seq < _last_written_seq:
+            return  # A newer save already reached the disk.
         # Ensure the directory for PROFILES_PATH exists
         profiles_dir = os.path.dirname(profiles_path)
         if not os.path.exists(profiles_dir) and profiles_dir : # Check profiles_dir is not empty string
              os.makedirs(profiles_dir, exist_ok=True)
 
-        with open(profiles_path, "w", encoding="utf-8") as f:
-            json.dump({"profiles": profiles, "last_active_profile_name": last_active_profile_name}, f, indent=4)
-        print(f"Profiles saved to: {profiles_path}")
+        # Write beside the target and swap it in, so a crash mid-write can never
+        # leave a truncated profiles file behind.
+        tmp_path = profiles_path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, profiles_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        _last_written_seq = seq
+    logger.info(f"Profiles saved to: {profiles_path}")
+
+
+def save_profiles(profiles, last_active_profile_name, profiles_path):
+    """Saves profiles and the last active profile name to PROFILES_PATH."""
+    try:
+        payload = _dumps({"profiles": profiles, "last_active_profile_name": last_active_profile_name})
+        _write_payload(_next_save_seq(), payload, profiles_path)
     except Exception as e:
-        print(f"Error saving profiles to {profiles_path}: {e}")
+        logger.error(f"Error saving profiles to {profiles_path}: {e}")
         # Re-raise for the GUI to catch and display the error to the user.
-        raise
\ No newline at end of file
+        raise
+
+
+def save_profiles_async(profiles, last_active_profile_name, profiles_path):
+    """
+    Queues a save on a background writer thread so the caller never blocks on disk IO.
+
+    The data is serialised immediately, so later mutations by the caller are not
+    picked up. Only the most recent pending request is written ("latest wins");
+    errors are logged rather than raised, so use save_profiles() when the caller
+    must report failures.
+    """
+    global _save_seq, _pending_save, _writer_thread
+    payload = _dumps({"profiles": profiles, "last_active_profile_name": last_active_profile_name})
+    with _state_lock:
+        _save_seq += 1
+        _pending_save = (_save_seq, payload, profiles_path)
+        if _writer_thread is None:
+            # Non-daemon so interpreter shutdown waits for an in-flight write.
+            _writer_thread = threading.Thread(target=_drain_pending_saves, name="ProfileSaver")
+            _writer_thread.start()
+
+
+def _drain_pending_saves():
+    global _pending_save, _writer_thread
+    while True:
+        with _state_lock:
+            job = _pending_save
+            _pending_save = None
+            if job is None:
+                _writer_thread = None
+                return
+        try:
+            _write_payload(*job)
+        except Exception as e:
+            logger.error(f"Error saving profiles to {job[2]}: {e}")
@@ -1,7 +1,16 @@
 # rule_manager.py
 
+import io
+import logging
 import os
+import re
+import fnmatch
 import configparser
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # .scanIgnore INI Format
@@ -25,6 +34,14 @@ import configparser
 
 _SECTIONS = ("Files", "Folders", "TreeBlacklist")
 
+# Characters that make a default-ignore pattern a glob rather than a plain name.
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+# Parsed .scanIgnore files, keyed by absolute path and stored with the
+# (mtime_ns, size) they were read at, so switching back to a profile whose
+# rules file is unchanged skips the parse.
+_rules_cache: dict[str, tuple[tuple[int, int], tuple[tuple, tuple, tuple]]] = {}
+
 
 def _make_parser() -> configparser.ConfigParser:
     """Returns a ConfigParser instance pre-configured for .scanIgnore files."""
@@ -37,23 +54,81 @@ def _make_parser() -> configparser.ConfigParser:
     return parser
 
 
-def load_ignore_rules(ignore_file_path: str) -> tuple[list, list, list]:
+class NamePatterns(NamedTuple):
+    """Compiled default-ignore patterns; build with compile_name_patterns()."""
+    literals: frozenset  # wildcard-free patterns, matched by set lookup
+    regex: re.Pattern | None  # alternation of the remaining globs
+
+
+def compile_name_patterns(patterns) -> NamePatterns | None:
+    """
+    Compiles fnmatch-style name patterns (as found in .scanIgnore.defaults).
+
+    Plain names such as ``.git`` or ``node_modules`` go into a set, so most
+    names are classified with one hash lookup. Only real globs are translated
+    into a single regex alternation, tested with one C-level match instead of
+    one fnmatch call per pattern.
+
+    Returns None when there are no patterns. Use matches_name_patterns() to
+    test names; it applies the same case normalisation as fnmatch.fnmatch.
+    """
+    if not patterns:
+        return None
+    return _compile_name_patterns(tuple(patterns))
+
+
+@lru_cache(maxsize=8)
+def _compile_name_patterns(patterns: tuple) -> NamePatterns:
+    # The defaults rarely change between tree loads, so each distinct pattern
+    # list is translated and compiled once per session.
+    normalized = [os.path.normcase(p) for p in patterns]
+    literals = frozenset(p for p in normalized if not _GLOB_CHARS.search(p))
+    globs = [p for p in normalized if p not in literals]
+    regex = re.compile("|".join(fnmatch.translate(p) for p in globs)) if globs else None
+    return NamePatterns(literals, regex)
+
+
+def matches_name_patterns(compiled: NamePatterns | None, name: str) -> bool:
+    """Returns True if *name* matches a pattern compiled by compile_name_patterns()."""
+    if compiled is None:
+        return False
+    name = os.path.normcase(name)
+    return name in compiled.literals or (
+        compiled.regex is not None and compiled.regex.match(name) is not None
+    )
+
+
+def load_ignore_rules(ignore_file_path: str) -> tuple[list[str], list[str], list[str]]:
     """
     Loads scan rules from an INI-style .scanIgnore file.
 
     Returns a 3-tuple:  (abs_files, abs_folders, abs_tree_blacklist)
 
-    All paths are returned as absolute, resolved relative to the directory
-    that contains the .scanIgnore file.
+    Each is a fresh, sorted, duplicate-free list of normalised absolute
+    paths, resolved relative to the directory that contains the .scanIgnore
+    file; callers may convert them to sets.
     """
     abs_files: list[str] = []
     abs_folders: list[str] = []
     abs_tree_blacklist: list[str] = []
 
-    if not ignore_file_path or not os.path.exists(ignore_file_path):
+    if not ignore_file_path:
         return abs_files, abs_folders, abs_tree_blacklist
 
-    base_dir = os.path.dirname(os.path.abspath(ignore_file_path))
+    abs_ignore_path = os.path.abspath(ignore_file_path)
+    base_dir = os.path.dirname(abs_ignore_path)
+
+    # One stat both fingerprints the file and, like read(), treats a missing
+    # or unreadable file as having no rules.
+    try:
+        st = os.stat(abs_ignore_path)
+    except OSError:
+        return abs_files, abs_folders, abs_tree_blacklist
+    fingerprint = (st.st_mtime_ns, st.st_size)
+    cached = _rules_cache.get(abs_ignore_path)
+    if cached is not None and cached[0] == fingerprint:
+        files, folders, blacklist = cached[1]
+        return list(files), list(folders), list(blacklist)
 
     try:
         parser = _make_parser()
@@ -61,53 +136,54 @@ def load_ignore_rules(ignore_file_path: str) -> tuple[list, list, list]:
         for section in _SECTIONS:
             parser.add_section(section)
 
-        parser.read(ignore_file_path, encoding="utf-8")
+        if not parser.read(ignore_file_path, encoding="utf-8"):
+            return abs_files, abs_folders, abs_tree_blacklist
 
         def _resolve(rel_path: str) -> str:
             return os.path.normpath(os.path.join(base_dir, rel_path))
 
-        for rel in parser.options("Files"):
-            abs_path = _resolve(rel)
-            if abs_path not in abs_files:
-                abs_files.append(abs_path)
-
-        for rel in parser.options("Folders"):
-            abs_path = _resolve(rel)
-            if abs_path not in abs_folders:
-                abs_folders.append(abs_path)
-
-        for rel in parser.options("TreeBlacklist"):
-            abs_path = _resolve(rel)
-            if abs_path not in abs_tree_blacklist:
-                abs_tree_blacklist.append(abs_path)
+        # Several relative keys can resolve to the same path; dedupe through a
+        # set instead of a linear `not in list` check per key.
+        abs_files = list({_resolve(rel) for rel in parser.options("Files")})
+        abs_folders = list({_resolve(rel) for rel in parser.options("Folders")})
+        abs_tree_blacklist = list({_resolve(rel) for rel in parser.options("TreeBlacklist")})
 
     except Exception as e:
-        print(f"Error loading or parsing ignore file '{ignore_file_path}': {e}")
+        logger.error(f"Error loading or parsing ignore file '{ignore_file_path}': {e}")
         raise  # Re-raise so the GUI can display the error
 
     abs_files.sort()
     abs_folders.sort()
     abs_tree_blacklist.sort()
 
+    _rules_cache[abs_ignore_path] = (
+        fingerprint, (tuple(abs_files), tuple(abs_folders), tuple(abs_tree_blacklist))
+    )
     return abs_files, abs_folders, abs_tree_blacklist
 
 
 def save_ignore_rules(
     ignore_file_path: str,
-    ignore_files: list[str],
-    ignore_folders: list[str],
-    tree_blacklist: list[str],
+    ignore_files: Iterable[str],
+    ignore_folders: Iterable[str],
+    tree_blacklist: Iterable[str],
 ) -> None:
     """
     Saves scan rules to an INI-style .scanIgnore file.
 
+    The three rule collections may be any iterables of absolute paths
+    (lists, sets, or the dict-keyed tree blacklist); each is written sorted.
     Absolute paths are converted to paths relative to the .scanIgnore
     file's directory before writing, enabling portability across machines.
     """
     if not ignore_file_path:
         raise ValueError("Cannot save ignore rules: No file path specified.")
 
-    base_dir = os.path.dirname(os.path.abspath(ignore_file_path))
+    abs_ignore_path = os.path.abspath(ignore_file_path)
+    base_dir = os.path.dirname(abs_ignore_path)
+    # Don't trust the fingerprint across our own write: on filesystems with
+    # coarse timestamps a same-size rewrite could look unchanged.
+    _rules_cache.pop(abs_ignore_path, None)
 
     def _make_relative(abs_path: str) -> str:
         try:
@@ -134,11 +210,15 @@ def save_ignore_rules(
         for abs_path in sorted(tree_blacklist):
             parser.set("TreeBlacklist", _make_relative(abs_path), None)
 
+        # configparser emits one small write() per key; render in memory and
+        # hand the file a single block instead.
+        buf = io.StringIO()
+        parser.write(buf)
         with open(ignore_file_path, "w", encoding="utf-8") as f:
-            parser.write(f)
+            f.write(buf.getvalue())
 
     except Exception as e:
-        print(f"Error saving ignore file '{ignore_file_path}': {e}")
+        logger.error(f"Error saving ignore file '{ignore_file_path}': {e}")
         raise  # Re-raise so the GUI can display the error
 
 
@@ -159,8 +239,8 @@ def create_empty_file(filepath: str) -> bool:
         with open(filepath, "w", encoding="utf-8") as f:
             parser.write(f)
 
-        print(f"Created empty .scanIgnore file: {filepath}")
+        logger.info(f"Created empty .scanIgnore file: {filepath}")
         return True
     except OSError as e:
-        print(f"Error creating empty .scanIgnore '{filepath}': {e}")
+        logger.error(f"Error creating empty .scanIgnore '{filepath}': {e}")
         raise
\ No newline at end of file
@@ -1,17 +1,54 @@
 # CodebaseScanner/scan_engine.py
 
+import logging
 import os
+import shutil
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from app_config import LANG_MAP, FILTER_BLACKLIST, FILTER_WHITELIST
 
-try:
-    import tiktoken
-    _ENCODER = tiktoken.get_encoding("cl100k_base")
-    _TIKTOKEN_AVAILABLE = True
-except ImportError:
-    _TIKTOKEN_AVAILABLE = False
-    _ENCODER = None
+logger = logging.getLogger(__name__)
+
+# tiktoken and its encoding tables are loaded on first use (normally on the
+# token worker thread) so importing this module does not delay the first paint.
+_ENCODER = None
+_TIKTOKEN_AVAILABLE = None  # None until the first _get_encoder() call
+_ENCODER_LOCK = threading.Lock()
 
 TREE_TOKENS_PER_ENTRY = 6  # heuristic: "├── filename\n" ≈ 4–8 tokens
+COPY_CHUNK_CHARS = 1 << 20  # file contents are streamed into the output in 1 Mi-char chunks
+OUTPUT_BUFFER_BYTES = 1 << 20  # userspace buffer for the scan output file; collapses small writes
+# Read-ahead is bounded in bytes, not just files: at most PREFETCH_WINDOW
+# files of at most PREFETCH_MAX_BYTES each (4 MiB of file data) are held ahead
+# of the writer, so memory stays bounded however large the files in a folder.
+PREFETCH_WINDOW = 16  # file reads kept in flight ahead of the writer when an executor is supplied
+PREFETCH_MAX_BYTES = 256 << 10  # larger files are not read ahead; they are streamed by the writer in chunks
+BINARY_SNIFF_BYTES = 8192  # a NUL byte in this much of the head marks a file as binary
+BINARY_FILE_NOTE = "*Binary file - contents not included.*\n\n"
+
+
+class ScanCancelled(Exception):
+    """Raised inside process_directory() when its cancel_event is set."""
+
+
+_IO_POOL = None
+_IO_POOL_LOCK = threading.Lock()
+
+
+def shared_io_pool() -> ThreadPoolExecutor:
+    """
+    Returns the process-wide pool used for file reads and token counting.
+    Created on first use and reused by every later scan and tree load, so
+    repeated runs do not pay for spinning up and tearing down threads.
+    """
+    global _IO_POOL
+    if _IO_POOL is None:
+        with _IO_POOL_LOCK:
+            if _IO_POOL is None:
+                _IO_POOL = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4),
+                                              thread_name_prefix="scan-io")
+    return _IO_POOL
 
 
 def get_language_hint(filename):
@@ -19,50 +56,112 @@ def get_language_hint(filename):
     return LANG_MAP.get(ext.lower(), "")
 
 
+def _get_encoder():
+    """Returns the shared tiktoken encoder, importing tiktoken on first call; None if unavailable."""
+    global _ENCODER, _TIKTOKEN_AVAILABLE
+    if _TIKTOKEN_AVAILABLE is None:
+        with _ENCODER_LOCK:
+            if _TIKTOKEN_AVAILABLE is None:
+                try:
+                    import tiktoken
+                    _ENCODER = tiktoken.get_encoding("cl100k_base")
+                    _TIKTOKEN_AVAILABLE = True
+                except ImportError:
+                    _TIKTOKEN_AVAILABLE = False
+    return _ENCODER
+
+
 def count_tokens_for_file(filepath: str) -> int:
     """Returns exact token count for a readable file. Returns 0 on error or if tiktoken unavailable."""
-    if not _TIKTOKEN_AVAILABLE:
+    encoder = _get_encoder()
+    if encoder is None:
         return 0
     try:
         with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-            return len(_ENCODER.encode(f.read()))
+            # encode_ordinary skips encode()'s special-token regex sweep, which runs
+            # in Python under the GIL; it also counts a literal "<|endoftext|>"
+            # in a source file instead of raising ValueError.
+            return len(encoder.encode_ordinary(f.read()))
     except OSError:
         return 0
 
 
-def estimate_tree_tokens(scan_dir: str, tree_blacklist: list) -> int:
-    """Heuristic token count for the rendered directory tree text."""
-    if not _TIKTOKEN_AVAILABLE:
+def estimate_tree_tokens(scan_dir: str, tree_blacklist: frozenset) -> int:
+    """
+    Heuristic token count for the rendered directory tree text.
+    *tree_blacklist* should be a set of normalised paths, as for write_directory_tree().
+    """
+    if _get_encoder() is None:
         return 0
-    norm_blacklist = {os.path.normpath(p) for p in tree_blacklist}
-    count = 0
-    for root, dirs, files in os.walk(scan_dir):
-        norm_root = os.path.normpath(root)
-        dirs[:] = [d for d in dirs if os.path.normpath(os.path.join(norm_root, d)) not in norm_blacklist]
-        count += (len(dirs) + len(files)) * TREE_TOKENS_PER_ENTRY
-    return count
-
-
-def generate_directory_tree_text(start_path, tree_blacklist, prefix="", is_last=True):
-    tree_string = ""
+    entries = 0
+    # Explicit scandir stack: entry.path is already joined onto the normalised
+    # parent, and the directory test reuses the type scandir returned.
+    stack = [os.path.normpath(scan_dir)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        entries += 1
+                    elif entry.path not in tree_blacklist:
+                        entries += 1
+                        # Like os.walk, list symlinked directories but do not descend into them.
+                        if not entry.is_symlink():
+                            stack.append(entry.path)
+        except OSError:
+            continue
+    return entries * TREE_TOKENS_PER_ENTRY
+
+
+def generate_directory_tree_text(start_path, tree_blacklist, prefix="", is_last=True, listing_cache=None):
+    """
+    Renders the tree below *start_path* and returns it as one string.
+    See write_directory_tree() for the arguments.
+    """
+    # Lines are collected as list items and joined once at the end.
+    parts = []
+    write_directory_tree(parts.append, start_path, tree_blacklist, prefix, is_last, listing_cache)
+    return "".join(parts)
+
+
+def write_directory_tree(write, start_path, tree_blacklist, prefix="", is_last=True, listing_cache=None):
+    """
+    Renders the tree below *start_path*, passing each finished line to
+    *write* (e.g. an open file's write method) instead of building the whole
+    text by repeated string concatenation. Returns False if *start_path*
+    itself is blacklisted and nothing was written.
+
+    *tree_blacklist* should be a set of normalised paths; children are tested
+    against it before recursing. If *listing_cache* is a dict, each
+    directory's scandir entries are stored in it by normalised path so
+    process_directory() can reuse them instead of listing the same
+    directories a second time. The cached listings are a snapshot taken
+    while the tree was written: a scan using them does not see files
+    added or removed after that point.
+    """
     normalized_start_path = os.path.normpath(start_path)
 
     if normalized_start_path in tree_blacklist:
-        return ""
+        return False
 
-    tree_string += prefix
+    # Each line is built by a single f-string rather than a chain of `+`
+    # concatenations, each of which allocates an intermediate string.
     if is_last:
-        tree_string += "└── "
+        write(f"{prefix}└── {os.path.basename(normalized_start_path)}/\n")
         prefix += "    "
     else:
-        tree_string += "├── "
+        write(f"{prefix}├── {os.path.basename(normalized_start_path)}/\n")
         prefix += "│   "
 
-    tree_string += os.path.basename(normalized_start_path) + "/\n"
-
     try:
-        entries = list(os.scandir(normalized_start_path))
-        entries.sort(key=lambda e: e.name.lower())
+        with os.scandir(normalized_start_path) as it:
+            entries = sorted(it, key=lambda e: e.name.lower())
+        if listing_cache is not None:
+            listing_cache[normalized_start_path] = entries
     except OSError:
         entries = []
 
@@ -70,50 +169,146 @@ def generate_directory_tree_text(start_path, tree_blacklist, prefix="", is_last=
     for i, entry in enumerate(entries):
         is_last_entry = (i == count - 1)
         if entry.is_dir():
-            tree_string += generate_directory_tree_text(entry.path, tree_blacklist, prefix, is_last_entry)
+            if entry.path in tree_blacklist:
+                continue
+            write_directory_tree(write, entry.path, tree_blacklist, prefix, is_last_entry, listing_cache)
+        elif is_last_entry:
+            write(f"{prefix}└── {entry.name}\n")
         else:
-            tree_string += prefix
-            if is_last_entry:
-                tree_string += "└── "
-            else:
-                tree_string += "├── "
-            tree_string += entry.name + "\n"
+            write(f"{prefix}├── {entry.name}\n")
+
+    return True
+
 
-    return tree_string
+def has_folder_ancestor(path, folders):
+    """
+    Returns True if a proper ancestor directory of the normalised *path* is in
+    *folders*. Walking up the path costs O(depth) membership tests, so with a
+    set/frozenset of folders this replaces an O(len(folders)) prefix scan.
+    Filesystem roots are never matched, as ``path.startswith(root + os.sep)``
+    never matched them either.
+    """
+    parent = os.path.dirname(path)
+    while parent:
+        grandparent = os.path.dirname(parent)
+        if grandparent == parent:
+            return False
+        if parent in folders:
+            return True
+        parent = grandparent
+    return False
+
+
+def folder_at_or_above(directory, folders):
+    """True if has_folder_ancestor() holds for every entry directly inside the normalised *directory*."""
+    if os.path.dirname(directory) != directory and directory in folders:
+        return True
+    return has_folder_ancestor(directory, folders)
 
 
 def should_process_item(item_path, is_file, rules_files, rules_folders, filter_mode, whitelisted_parent_folders):
-    normalized_item_path = os.path.normpath(item_path)
+    return should_process_normalized(os.path.normpath(item_path), is_file, rules_files, rules_folders,
+                                     filter_mode, whitelisted_parent_folders)
 
+
+def should_process_normalized(normalized_item_path, is_file, rules_files, rules_folders, filter_mode, whitelisted_parent_folders):
+    """should_process_item() for a path that is already normalised, e.g. a DirEntry.path below a normalised root."""
     if filter_mode == FILTER_BLACKLIST:
         if is_file:
             if normalized_item_path in rules_files:
                 return False
-            for folder_rule in rules_folders:
-                if normalized_item_path.startswith(folder_rule + os.sep):
-                    return False
         else:
             if normalized_item_path in rules_folders:
                 return False
-            for folder_rule in rules_folders:
-                if normalized_item_path.startswith(folder_rule + os.sep):
-                    return False
+        if rules_folders and has_folder_ancestor(normalized_item_path, rules_folders):
+            return False
         return True
 
     elif filter_mode == FILTER_WHITELIST:
-        for whitelisted_folder_path in whitelisted_parent_folders:
-            if normalized_item_path.startswith(whitelisted_folder_path + os.sep) or normalized_item_path == whitelisted_folder_path:
-                return True
+        if whitelisted_parent_folders and (
+            normalized_item_path in whitelisted_parent_folders
+            or has_folder_ancestor(normalized_item_path, whitelisted_parent_folders)
+        ):
+            return True
         if is_file:
             return normalized_item_path in rules_files
         else:
             return normalized_item_path in rules_folders
 
-    print(f"Warning: Unknown filter mode '{filter_mode}'.")
+    logger.warning(f"Unknown filter mode '{filter_mode}'.")
     return True
 
 
-def process_directory(directory, output_file, rules_files, rules_folders, filter_mode, level=0, status_callback=None, whitelisted_ancestor_folders=None):
+def _entry_is_file(entry):
+    """DirEntry.is_file() with os.path.isfile()'s never-raise semantics."""
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+_BINARY = object()  # _prefetch_file_text() result for a binary file
+
+
+def _looks_binary(f_content):
+    """Checks the head of a freshly opened text file for NUL bytes.
+
+    peek() inspects the bytes the first read fills the buffer with anyway, so
+    the sniff costs no extra syscall and the text read continues from the start.
+    """
+    return b"\0" in f_content.buffer.peek(BINARY_SNIFF_BYTES)[:BINARY_SNIFF_BYTES]
+
+
+def _prefetch_file_text(file_path):
+    """Reads a small file's text on a pool thread; returns None when it should be streamed instead."""
+    with open(file_path, "r", encoding="utf-8", errors='ignore') as f_content:
+        if _looks_binary(f_content):
+            return _BINARY
+        if os.fstat(f_content.fileno()).st_size > PREFETCH_MAX_BYTES:
+            return None
+        return f_content.read()
+
+
+def _write_file_body(output_file, file_path, file_name, status_callback, prefetched=None):
+    if prefetched is _BINARY:
+        output_file.write(BINARY_FILE_NOTE)
+        return
+    lang_hint = get_language_hint(file_name)
+    if prefetched is not None:
+        output_file.write(f"```{lang_hint}\n")
+        output_file.write(prefetched)
+        output_file.write(f"\n```\n\n")
+        return
+    fence_open = False
+    try:
+        with open(file_path, "r", encoding="utf-8", errors='ignore') as f_content:
+            if _looks_binary(f_content):
+                output_file.write(BINARY_FILE_NOTE)
+                return
+            output_file.write(f"```{lang_hint}\n")
+            fence_open = True
+            # Stream in bounded chunks instead of materialising the whole file.
+            shutil.copyfileobj(f_content, output_file, COPY_CHUNK_CHARS)
+        output_file.write(f"\n```\n\n")
+    except Exception as e:
+        if fence_open:
+            output_file.write(f"\n```\n\n")
+        output_file.write(f"**Error reading file:** `{e}`\n\n")
+        if status_callback:
+            status_callback(f"Error reading file: {file_path} - {e}")
+
+
+def _evict_cached_listings(listing_cache, dir_path):
+    """Drops the cached listings of *dir_path* and of every directory below it."""
+    stack = [dir_path]
+    while stack:
+        entries = listing_cache.pop(stack.pop(), None)
+        if entries:
+            # Only directories are keys, so popping a file's path is a no-op.
+            stack.extend(entry.path for entry in entries)
+
+
+def process_directory(directory, output_file, rules_files, rules_folders, filter_mode, level=0, status_callback=None, whitelisted_ancestor_folders=None, executor=None, listing_cache=None, cancel_event=None):
     heading_level = level + 2
     heading_prefix = "#" * heading_level
     content_written_for_this_branch = False
@@ -124,11 +319,20 @@ def process_directory(directory, output_file, rules_files, rules_folders, filter
         if normalized_directory not in current_whitelisted_ancestors:
             current_whitelisted_ancestors.append(normalized_directory)
 
+    if cancel_event is not None and cancel_event.is_set():
+        raise ScanCancelled()
+
     if status_callback:
         status_callback(f"Processing: {normalized_directory}")
 
     try:
-        items = os.listdir(normalized_directory)
+        if listing_cache is not None and normalized_directory in listing_cache:
+            # Already listed while rendering the tree; each listing is used once.
+            items = listing_cache.pop(normalized_directory)
+        else:
+            # scandir returns the entry type alongside the name, so no per-item stat is needed.
+            with os.scandir(normalized_directory) as it:
+                items = list(it)
     except Exception as e:
         is_dir_in_whitelisted_scope = False
         if filter_mode == FILTER_WHITELIST:
@@ -149,18 +353,43 @@ def process_directory(directory, output_file, rules_files, rules_folders, filter
         return content_written_for_this_branch
 
     files_to_output = []
-    dirs_to_recurse_info = []
-
-    for item_name in items:
-        item_path = os.path.join(normalized_directory, item_name)
-        normalized_item_path = os.path.normpath(item_path)
-        is_file = os.path.isfile(normalized_item_path)
+    # (name, path) pairs: sorting tuples orders by name with no key function.
+    dirs_to_recurse = []
+    # The folder-rule part of should_process_item() depends only on an entry's
+    # ancestors, which every entry here shares: decide it once for the
+    # directory, leaving one set lookup per entry.
+    if filter_mode == FILTER_BLACKLIST:
+        include_all = not rules_files and not rules_folders
+        exclude_all = bool(rules_folders) and folder_at_or_above(normalized_directory, rules_folders)
+    elif filter_mode == FILTER_WHITELIST:
+        include_all = bool(current_whitelisted_ancestors) and folder_at_or_above(
+            normalized_directory, frozenset(current_whitelisted_ancestors))
+        exclude_all = False
+    else:
+        include_all = exclude_all = False
+
+    for entry in items:
+        item_name = entry.name
+        # entry.path is the normalised directory joined with a bare name, so it is already normalised.
+        normalized_item_path = entry.path
+        is_file = _entry_is_file(entry)
+
+        if include_all:
+            included = True
+        elif exclude_all:
+            included = False
+        elif filter_mode == FILTER_BLACKLIST:
+            included = normalized_item_path not in (rules_files if is_file else rules_folders)
+        elif filter_mode == FILTER_WHITELIST:
+            included = normalized_item_path in (rules_files if is_file else rules_folders)
+        else:
+            included = should_process_normalized(normalized_item_path, is_file, rules_files, rules_folders, filter_mode, current_whitelisted_ancestors)
 
-        if should_process_item(normalized_item_path, is_file, rules_files, rules_folders, filter_mode, current_whitelisted_ancestors):
+        if included:
             if is_file:
                 files_to_output.append(item_name)
             else:
-                dirs_to_recurse_info.append({'name': item_name, 'path': normalized_item_path, 'ancestors': list(current_whitelisted_ancestors)})
+                dirs_to_recurse.append((item_name, normalized_item_path))
         elif filter_mode == FILTER_WHITELIST and not is_file:
             can_contain_whitelisted = False
             for rf_path in rules_files:
@@ -173,20 +402,25 @@ def process_directory(directory, output_file, rules_files, rules_folders, filter
                         can_contain_whitelisted = True
                         break
             if can_contain_whitelisted:
-                dirs_to_recurse_info.append({'name': item_name, 'path': normalized_item_path, 'ancestors': list(current_whitelisted_ancestors)})
+                dirs_to_recurse.append((item_name, normalized_item_path))
+
+    if listing_cache:
+        # Listings cached by the tree pass for subtrees pruned here would
+        # otherwise stay alive until the whole scan finishes.
+        recursed = {dir_path for _, dir_path in dirs_to_recurse}
+        for entry in items:
+            if entry.path not in recursed and entry.path in listing_cache:
+                _evict_cached_listings(listing_cache, entry.path)
 
     files_to_output.sort()
-    dirs_to_recurse_info.sort(key=lambda x: x['name'])
+    dirs_to_recurse.sort()
 
     processed_subdirs_with_content = []
-    for dir_info in dirs_to_recurse_info:
-        next_level_ancestors = list(dir_info['ancestors'])
-        if filter_mode == FILTER_WHITELIST and dir_info['path'] in rules_folders:
-            if dir_info['path'] not in next_level_ancestors:
-                next_level_ancestors.append(dir_info['path'])
-        if process_directory(dir_info['path'], output_file, rules_files, rules_folders, filter_mode, level + 1, status_callback, next_level_ancestors):
+    for dir_name, dir_path in dirs_to_recurse:
+        # The child copies this list and adds itself if it is a whitelisted folder.
+        if process_directory(dir_path, output_file, rules_files, rules_folders, filter_mode, level + 1, status_callback, current_whitelisted_ancestors, executor, listing_cache, cancel_event):
             content_written_for_this_branch = True
-            processed_subdirs_with_content.append(dir_info['name'])
+            processed_subdirs_with_content.append(dir_name)
 
     should_write_header = False
     is_current_dir_in_whitelisted_scope = False
@@ -220,20 +454,29 @@ def process_directory(directory, output_file, rules_files, rules_folders, filter
     if files_to_output:
         file_heading_prefix = "#" * (heading_level + 1)
         output_file.write(f"{file_heading_prefix} Files\n\n")
-        for file_name in files_to_output:
-            file_path = os.path.normpath(os.path.join(normalized_directory, file_name))
+        file_paths = [os.path.join(normalized_directory, name) for name in files_to_output]
+        # With an executor, up to PREFETCH_WINDOW reads run ahead on pool threads
+        # while bodies are written here strictly in sorted order.
+        in_flight = deque()
+        next_submit = 0
+        for idx, file_name in enumerate(files_to_output):
+            if cancel_event is not None and cancel_event.is_set():
+                for pending in in_flight:
+                    pending.cancel()
+                raise ScanCancelled()
+            file_path = file_paths[idx]
+            prefetched = None
+            if executor is not None:
+                while next_submit < len(file_paths) and len(in_flight) < PREFETCH_WINDOW:
+                    in_flight.append(executor.submit(_prefetch_file_text, file_paths[next_submit]))
+                    next_submit += 1
+                try:
+                    prefetched = in_flight.popleft().result()
+                except Exception:
+                    # Fall back to the streaming path, which reports the error in the output.
+                    prefetched = None
             output_file.write(f"**File:** `{file_name}`\n")
-            lang_hint = get_language_hint(file_name)
-            try:
-                with open(file_path, "r", encoding="utf-8", errors='ignore') as f_content:
-                    content = f_content.read()
-                output_file.write(f"```{lang_hint}\n")
-                output_file.write(content)
-                output_file.write(f"\n```\n\n")
-            except Exception as e:
-                output_file.write(f"**Error reading file:** `{e}`\n\n")
-                if status_callback:
-                    status_callback(f"Error reading file: {file_path} - {e}")
+            _write_file_body(output_file, file_path, file_name, status_callback, prefetched)
     elif not items and not processed_subdirs_with_content:
         if filter_mode == FILTER_BLACKLIST or (filter_mode == FILTER_WHITELIST and is_current_dir_in_whitelisted_scope):
             output_file.write(f"*This folder is empty or all its contents were excluded/not included by rules.*\n\n")